@@ -1,10 +1,13 @@
+import os
+from functools import partial
 from pocketflow import Flow, BatchFlow
-from nodes import LoadImage, ApplyFilter, SaveImage
+from nodes import LoadImage, ApplyFilter, SaveImage, get_output_path
+from utils.executor import get_executor
 
-def create_base_flow():
+def create_base_flow(target_size=None, pixel_cache=None):
     """Create the base Flow for processing a single image."""
     # Create nodes
-    load = LoadImage()
+    load = LoadImage(target_size=target_size, cache=pixel_cache)
     filter_node = ApplyFilter()
     save = SaveImage()
     
@@ -15,34 +18,159 @@ def create_base_flow():
     # Create and return flow
     return Flow(start=load)
 
-class ImageBatchFlow(BatchFlow):
+class ParallelBatchFlow(BatchFlow):
+    """BatchFlow that can run its sub-flows on a thread or process pool.
+    
+    Nodes stay synchronous. Each sub-flow runs on its own shallow copy of
+    the shared store, so concurrent branches never see each other's
+    intermediate values. The keys listed in `collect` are copied back from
+    every branch and passed to post() as a list in the same order as the
+    params, whichever backend ran them.
+    """
+    
+    def __init__(self, start=None, executor=None, max_workers=None, collect=()):
+        """Initialize the batch flow.
+        
+        Args:
+            start: Base flow run once per parameter set
+            executor: None to run sub-flows one after another, "thread",
+                "process", or an Executor instance
+            max_workers: Pool size for "thread" and "process"
+            collect: Shared-store keys to return from each sub-flow
+        """
+        super().__init__(start=start)
+        self.executor = executor
+        self.max_workers = max_workers
+        self.collect = tuple(collect)
+    
+    def _run(self, shared):
+        pr = self.prep(shared) or []
+        run = partial(_run_branch, self, shared)
+        if self.executor is None:
+            results = [run(bp) for bp in pr]
+        else:
+            # map() yields results in submission order
+            results = list(get_executor(self.executor, self.max_workers).map(run, pr))
+        return self.post(shared, pr, results)
+
+def _run_branch(batch_flow, shared, bp):
+    """Run one sub-flow on a private copy of the shared store.
+    
+    Module-level so it can be pickled for process pools.
+    """
+    branch_shared = dict(shared)
+    batch_flow._orch(branch_shared, {**batch_flow.params, **bp})
+    return {key: branch_shared[key] for key in batch_flow.collect if key in branch_shared}
+
+def scan_images(images_dir="images"):
+    """List the image files in images_dir, sorted by name."""
+    return sorted(
+        entry.name for entry in os.scandir(images_dir)
+        if entry.is_file() and entry.name.lower().endswith((".jpg", ".jpeg", ".png"))
+    )
+
+# List of filters to apply
+FILTERS = ["grayscale", "blur", "sepia"]
+
+class ImageBatchFlow(ParallelBatchFlow):
     """BatchFlow for processing multiple images with different filters."""
     
+    def __init__(self, start=None, fan_out=False, executor=None, max_workers=None, manifest=None, settings=None):
+        """Initialize the batch flow.
+        
+        Args:
+            start: Base flow run once per parameter set
+            fan_out: If True, run the base flow once per image, decoding it
+                once and applying every filter, instead of once per
+                image-filter combination
+            executor: Backend for the sub-flows (None, "thread" or "process")
+            max_workers: Pool size for the backend
+            manifest: Optional BuildManifest; outputs it reports as current
+                are skipped, including their load/filter/save sub-flow
+            settings: Output-affecting settings recorded in the manifest
+        """
+        super().__init__(start=start, executor=executor, max_workers=max_workers, collect=["outputs"])
+        self.fan_out = fan_out
+        self.manifest = manifest
+        self.settings = settings or {}
+    
     def prep(self, shared):
-        """Generate parameters for each image-filter combination."""
-        # List of images to process
-        images = ["cat.jpg", "dog.jpg", "bird.jpg"]
+        """Generate parameters for each image (fan-out) or image-filter combination."""
+        # Images found in the images directory
+        self.images_dir = shared.get("images_dir", "images")
+        images = scan_images(self.images_dir)
         
-        # List of filters to apply
-        filters = ["grayscale", "blur", "sepia"]
+        if self.fan_out:
+            params = []
+            for img in images:
+                stale = self._stale_filters(img)
+                if stale:
+                    params.append({"input": img, "filters": stale})
+            return params
         
         # Generate all combinations
         params = []
         for img in images:
-            for f in filters:
+            for f in self._stale_filters(img):
                 params.append({
                     "input": img,
                     "filter": f
                 })
         
         return params
+    
+    def _stale_filters(self, img):
+        """Filters whose output for img is missing or out of date."""
+        if self.manifest is None:
+            return FILTERS
+        image_path = os.path.join(self.images_dir, img)
+        stale = [
+            f for f in FILTERS
+            if not self.manifest.is_current(
+                get_output_path(img, f),
+                self.manifest.signature(image_path, f, self.settings)
+            )
+        ]
+        if len(stale) < len(FILTERS):
+            print(f"Up to date: {img} ({len(FILTERS) - len(stale)} of {len(FILTERS)} outputs)")
+        return stale
+    
+    def post(self, shared, prep_res, exec_res):
+        """Collect output paths in parameter order, print them and update the manifest."""
+        shared["outputs"] = []
+        for bp, res in zip(prep_res, exec_res):
+            # SaveImage returns paths in the same order as the filters
+            filters = bp.get("filters") or [bp["filter"]]
+            for f, path in zip(filters, res.get("outputs", [])):
+                shared["outputs"].append(path)
+                print(f"Saved filtered image to: {path}")
+                if self.manifest is not None:
+                    image_path = os.path.join(self.images_dir, bp["input"])
+                    self.manifest.record(path, self.manifest.signature(image_path, f, self.settings))
+        
+        if self.manifest is not None:
+            self.manifest.save()
+        return "default"
 
-def create_flow():
-    """Create the complete batch processing flow."""
+def create_flow(fan_out=False, executor=None, max_workers=None, target_size=None, pixel_cache=None,
+                manifest=None):
+    """Create the complete batch processing flow.
+    
+    Args:
+        fan_out: Decode each image once and apply every filter to it
+        executor: Backend for the sub-flows (None, "thread" or "process")
+        max_workers: Pool size for the backend
+        target_size: Optional (width, height) to draft-decode images down to
+        pixel_cache: Optional PixelCache so repeated runs skip decoding
+        manifest: Optional BuildManifest so up-to-date outputs are skipped
+    """
     # Create base flow for single image processing
-    base_flow = create_base_flow()
+    base_flow = create_base_flow(target_size, pixel_cache)
     
     # Wrap in BatchFlow for multiple images
-    batch_flow = ImageBatchFlow(start=base_flow)
+    batch_flow = ImageBatchFlow(
+        start=base_flow, fan_out=fan_out, executor=executor, max_workers=max_workers,
+        manifest=manifest, settings={"target_size": target_size}
+    )
     
-    return batch_flow 
\ No newline at end of file
+    return batch_flow
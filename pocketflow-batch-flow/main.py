@@ -2,13 +2,27 @@ import os
 from PIL import Image
 import numpy as np
 from flow import create_flow
+from utils.executor import shutdown_executors
+from utils.pixel_cache import PixelCache
+from utils.manifest import BuildManifest
 
 def main():
     # Create and run flow
     print("Processing images with filters...")
     
-    flow = create_flow()
-    flow.run({}) 
+    # Decode each image once and apply every filter to it, running
+    # images on a thread pool (PIL releases the GIL while it works) and
+    # caching decoded pixels so the next run skips JPEG decoding. Outputs
+    # already built from the same input and settings are skipped entirely.
+    pixel_cache = PixelCache(".pixel_cache", max_bytes=512 * 2**20)
+    manifest = BuildManifest(os.path.join("output", ".manifest.json"))
+    flow = create_flow(
+        fan_out=True, executor="thread", max_workers=4, pixel_cache=pixel_cache, manifest=manifest
+    )
+    try:
+        flow.run({})
+    finally:
+        shutdown_executors()
     
     print("\nAll images processed successfully!")
     print("Check the 'output' directory for results.")
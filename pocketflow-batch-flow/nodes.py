@@ -1,19 +1,57 @@
 """Node implementations for image processing."""
 
 import os
+import numpy as np
 from PIL import Image, ImageEnhance, ImageFilter
 from pocketflow import Node
+from utils.pixel_cache import CACHEABLE_MODES
+
+def get_output_path(input_file, filter_name):
+    """Output file for an image-filter combination."""
+    input_name = os.path.splitext(input_file)[0]
+    return os.path.join("output", f"{input_name}_{filter_name}.jpg")
 
 class LoadImage(Node):
     """Node that loads an image file."""
     
+    def __init__(self, target_size=None, cache=None):
+        """Initialize with an optional (width, height) to decode down to and
+        an optional PixelCache of decoded pixels."""
+        super().__init__()
+        self.target_size = target_size
+        self.cache = cache
+    
     def prep(self, shared):
         """Get image path from parameters."""
-        return os.path.join("images", self.params["input"])
+        return os.path.join(shared.get("images_dir", "images"), self.params["input"])
     
     def exec(self, image_path):
-        """Load the image using PIL."""
-        return Image.open(image_path)
+        """Load and decode the image using PIL.
+        
+        Image.open only reads the header. With target_size set, draft()
+        makes the JPEG decoder scale by 1/2, 1/4 or 1/8 during decoding, so
+        full-resolution pixels are never produced. thumbnail() then resizes
+        the rest of the way, keeping the aspect ratio.
+        
+        With a PixelCache, a hit is built from the memory-mapped pixels
+        without decoding, and a miss stores the decoded pixels.
+        """
+        if self.cache is not None:
+            pixels = self.cache.get(image_path, self.target_size)
+            if pixels is not None:
+                return Image.fromarray(pixels)
+        
+        image = Image.open(image_path)
+        if self.target_size:
+            width, height = image.size
+            scale = min(self.target_size[0] / width, self.target_size[1] / height, 1)
+            image.draft(image.mode, (max(1, round(width * scale)), max(1, round(height * scale))))
+            image.thumbnail(self.target_size)
+        image.load()
+        
+        if self.cache is not None and image.mode in CACHEABLE_MODES:
+            self.cache.put(image_path, np.asarray(image), self.target_size)
+        return image
     
     def post(self, shared, prep_res, exec_res):
         """Store the image in shared store."""
@@ -21,16 +59,22 @@ class LoadImage(Node):
         return "apply_filter"
 
 class ApplyFilter(Node):
-    """Node that applies a filter to an image."""
+    """Node that applies one or more filters to an image."""
     
     def prep(self, shared):
-        """Get image and filter type."""
-        return shared["image"], self.params["filter"]
+        """Get image and the filter(s) to apply to it."""
+        # Fan-out params carry a list of filters for one decoded image
+        filter_types = self.params.get("filters") or [self.params["filter"]]
+        return shared["image"], filter_types
     
     def exec(self, inputs):
-        """Apply the specified filter."""
-        image, filter_type = inputs
-        
+        """Apply every requested filter to the same decoded image."""
+        image, filter_types = inputs
+        return {filter_type: self.apply_filter(image, filter_type) for filter_type in filter_types}
+    
+    @staticmethod
+    def apply_filter(image, filter_type):
+        """Apply a single named filter."""
         if filter_type == "grayscale":
             return image.convert("L")
         elif filter_type == "blur":
@@ -45,32 +89,31 @@ class ApplyFilter(Node):
             raise ValueError(f"Unknown filter: {filter_type}")
     
     def post(self, shared, prep_res, exec_res):
-        """Store the filtered image."""
-        shared["filtered_image"] = exec_res
+        """Store the filtered images, keyed by filter type."""
+        shared["filtered_images"] = exec_res
         return "save"
 
 class SaveImage(Node):
-    """Node that saves the processed image."""
+    """Node that saves the processed images."""
     
     def prep(self, shared):
-        """Get filtered image and prepare output path."""
+        """Get filtered images and prepare their output paths."""
         # Create output directory if it doesn't exist
         os.makedirs("output", exist_ok=True)
         
-        # Generate output filename
-        input_name = os.path.splitext(self.params["input"])[0]
-        filter_name = self.params["filter"]
-        output_path = os.path.join("output", f"{input_name}_{filter_name}.jpg")
-        
-        return shared["filtered_image"], output_path
+        # Generate output filenames
+        return [
+            (image, get_output_path(self.params["input"], filter_name))
+            for filter_name, image in shared["filtered_images"].items()
+        ]
     
-    def exec(self, inputs):
-        """Save the image to file."""
-        image, output_path = inputs
-        image.save(output_path, "JPEG")
-        return output_path
+    def exec(self, outputs):
+        """Save the images to file."""
+        for image, output_path in outputs:
+            image.save(output_path, "JPEG")
+        return [output_path for _, output_path in outputs]
     
     def post(self, shared, prep_res, exec_res):
-        """Print success message."""
-        print(f"Saved filtered image to: {exec_res}")
-        return "default" 
\ No newline at end of file
+        """Record the saved paths; ImageBatchFlow prints them in order."""
+        shared["outputs"] = exec_res
+        return "default"
@@ -0,0 +1,34 @@
+"""Shared thread and process pools for running batch branches in parallel."""
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+# Shared pools, created on first use and keyed by (kind, max_workers)
+_executors = {}
+
+def get_executor(kind, max_workers=None):
+    """Return a shared executor for the given kind.
+
+    Args:
+        kind: "thread" for work that releases the GIL (PIL decode, filters,
+            encode, file I/O), "process" for work that holds it, or an
+            Executor instance which is returned unchanged.
+        max_workers: Pool size, defaults to the pool's own default.
+    """
+    if isinstance(kind, Executor):
+        return kind
+
+    key = (kind, max_workers)
+    if key not in _executors:
+        if kind == "thread":
+            _executors[key] = ThreadPoolExecutor(max_workers=max_workers)
+        elif kind == "process":
+            _executors[key] = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            raise ValueError(f"Unknown executor: {kind}")
+    return _executors[key]
+
+def shutdown_executors():
+    """Shut down all shared executors."""
+    for pool in _executors.values():
+        pool.shutdown()
+    _executors.clear()
@@ -0,0 +1,118 @@
+"""Persistent on-disk cache of decoded pixel arrays, read back with np.memmap.
+
+Entries are .npy files keyed by the source path, size and mtime (plus the
+decode target size), so editing or replacing a source image invalidates its
+entry. Hits are memory-mapped rather than read, so repeated runs skip JPEG
+decoding entirely, and every process that maps the same entry shares its
+pages through the OS page cache. The directory is kept under a byte budget
+by evicting the least recently used entries. A running byte total, seeded by
+one directory scan, means the directory is only scanned again when a put
+takes the total over budget.
+
+This module is deliberately duplicated in pocketflow-parallel-batch-flow/utils/,
+so each example runs standalone. Apply every change to both copies.
+"""
+
+import os
+import hashlib
+import threading
+import numpy as np
+
+# Modes whose pixels round-trip through np.asarray / Image.fromarray
+CACHEABLE_MODES = ("L", "RGB", "RGBA")
+
+class PixelCache:
+    """LRU-bounded directory of memory-mapped decoded images."""
+
+    def __init__(self, cache_dir=".pixel_cache", max_bytes=1 << 30):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the .npy entries
+            max_bytes: Total size budget for all entries
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        # Bytes in the cache; other processes' writes are picked up by evict()
+        self.total = sum(size for _, size, _ in self._scan())
+
+    def __getstate__(self):
+        # Locks cannot be pickled; process workers get a fresh one
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def _entry_path(self, image_path, target_size):
+        """Return the entry path for the current version of image_path."""
+        stat = os.stat(image_path)
+        key = f"{os.path.abspath(image_path)}|{stat.st_size}|{stat.st_mtime_ns}|{target_size}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".npy")
+
+    def get(self, image_path, target_size=None):
+        """Return a read-only memmap of the cached pixels, or None on a miss."""
+        entry = self._entry_path(image_path, target_size)
+        try:
+            pixels = np.load(entry, mmap_mode="r")
+            # Bump the mtime, which is what eviction orders by
+            os.utime(entry)
+            return pixels
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put(self, image_path, pixels, target_size=None):
+        """Store decoded pixels, then evict old entries if over budget."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = self._entry_path(image_path, target_size)
+        # Unique temp name so concurrent writers never see partial files
+        tmp = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(pixels))
+        size = os.path.getsize(tmp)
+        try:
+            replaced = os.path.getsize(entry)
+        except FileNotFoundError:
+            replaced = 0
+        os.replace(tmp, entry)
+
+        with self.lock:
+            self.total += size - replaced
+            over_budget = self.total > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def _scan(self):
+        """Return (mtime_ns, size, path) for every entry on disk."""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for dir_entry in os.scandir(self.cache_dir):
+            if not dir_entry.name.endswith(".npy"):
+                continue
+            try:
+                stat = dir_entry.stat()
+            except FileNotFoundError:
+                continue  # Removed by another process
+            entries.append((stat.st_mtime_ns, stat.st_size, dir_entry.path))
+        return entries
+
+    def evict(self):
+        """Delete least recently used entries until within max_bytes."""
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Already evicted by another process
+            except OSError:
+                continue  # Still mapped on a platform that forbids removal
+            total -= size
+        with self.lock:
+            self.total = total
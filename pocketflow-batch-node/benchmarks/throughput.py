@@ -0,0 +1,179 @@
+"""Throughput, peak memory and CPU time of create_flow() across configurations.
+
+Generates sales files of the requested row counts (cached in benchmarks/data)
+with utils.generate, then runs the flow once per row count x mode x chunk
+size. Each run happens in a fresh interpreter so that peak RSS and child
+process CPU time belong to that run alone.
+
+Modes:
+    c          sequential chunks, pandas' C parser
+    pyarrow    sequential chunks, pyarrow's streaming reader
+    sidecar    sequential chunks from a pre-built memory-mapped sidecar
+    adaptive   AdaptiveChunkSizer under --memory-budget (chunk size ignored)
+    parallel   byte ranges in --workers processes (chunk size ignored)
+
+CPU time is split into the main thread's reading (parsing and iteration),
+exec and fold time, CPU used by other threads (pyarrow's reader pool) and
+CPU used by worker processes.
+
+Usage (from the example directory):
+    python -m benchmarks.throughput [--rows 1000000 10000000]
+        [--chunk-sizes 10000 100000 1000000] [--modes c pyarrow parallel]
+        [--workers 8] [--memory-budget 67108864] [--groups product date]
+        [--no-groups] [--json out.json]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import contextlib
+
+EXAMPLE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(EXAMPLE_DIR, "benchmarks", "data")
+MODES = ["c", "pyarrow", "sidecar", "adaptive", "parallel"]
+CHUNKED_MODES = ["c", "pyarrow", "sidecar"]
+
+def peak_rss():
+    """Peak resident set size of this process in bytes."""
+    # VmHWM starts afresh at exec; ru_maxrss on Linux keeps the forking parent's peak
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def run_one(config):
+    """Run the flow once as described by config and return its measurements."""
+    import nodes
+    from flow import create_flow
+    from utils.sidecar import ColumnarSidecar
+
+    # Main-thread CPU time spent in exec and fold
+    stage_cpu = {"exec": 0.0, "fold": 0.0}
+    for name in stage_cpu:
+        original = getattr(nodes.CSVProcessor, name)
+        def timed(self, *args, _original=original, _name=name):
+            start = time.thread_time()
+            try:
+                return _original(self, *args)
+            finally:
+                stage_cpu[_name] += time.thread_time() - start
+        setattr(nodes.CSVProcessor, name, timed)
+
+    mode = config["mode"]
+    options = {"group_by": config["group_by"]}
+    if mode in CHUNKED_MODES:
+        options["chunk_size"] = config["chunk_size"]
+        options["engine"] = "pyarrow" if mode == "pyarrow" else "c"
+    if mode == "sidecar":
+        options["sidecar"] = ColumnarSidecar(os.path.join(DATA_DIR, ".csv_cache"))
+    elif mode == "adaptive":
+        options["memory_budget"] = config["memory_budget"]
+    elif mode == "parallel":
+        options.update(parallel=True, workers=config["workers"])
+
+    flow = create_flow(**options)
+    shared = {"input_file": config["file"]}
+    own, children = resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)
+    wall, thread_cpu = time.perf_counter(), time.thread_time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        flow.run(shared)
+    wall, thread_cpu = time.perf_counter() - wall, time.thread_time() - thread_cpu
+
+    # CPU used during the run only, not by interpreter start-up and imports
+    own_after = resource.getrusage(resource.RUSAGE_SELF)
+    children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    user, system = own_after.ru_utime - own.ru_utime, own_after.ru_stime - own.ru_stime
+    return {
+        **config,
+        "wall_s": wall,
+        "rows_per_s": shared["statistics"]["total_transactions"] / wall,
+        "peak_rss_mb": peak_rss() / 2**20,
+        "cpu_s": {
+            "user": user,
+            "system": system,
+            "read": thread_cpu - stage_cpu["exec"] - stage_cpu["fold"],
+            "exec": stage_cpu["exec"],
+            "fold": stage_cpu["fold"],
+            "other_threads": max(user + system - thread_cpu, 0.0),
+            "workers": (children_after.ru_utime - children.ru_utime) + (children_after.ru_stime - children.ru_stime)
+        },
+        "chunk_sizes": shared.get("chunk_sizes", [])[:8]
+    }
+
+def spawn(config):
+    """Run one configuration in a fresh interpreter and return its result."""
+    # Run inside DATA_DIR so files like .chunk_sizes.json are written there
+    env = {**os.environ, "PYTHONPATH": EXAMPLE_DIR}
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.throughput", "--child", json.dumps(config)],
+        cwd=DATA_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def ensure_data(rows):
+    """Return the path of a generated sales file with the given row count."""
+    from utils.generate import generate_sales
+    path = os.path.join(DATA_DIR, f"sales_{rows}.csv")
+    if not os.path.exists(path):
+        print(f"Generating {rows:,} rows...", flush=True)
+        generate_sales(path, rows)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--memory-budget", type=int, default=64 * 2**20)
+    parser.add_argument("--groups", nargs="+", choices=["product", "date"], default=["product"])
+    parser.add_argument("--no-groups", action="store_true", help="Global statistics only")
+    parser.add_argument("--json", help="Also write all results to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_one(json.loads(args.child))))
+        return
+
+    group_by = [] if args.no_groups else args.groups
+    print(f"{os.cpu_count()} CPUs, group_by={group_by}\n")
+    print(f"{'rows':>12} {'mode':<9}{'chunk':>9}{'wall s':>9}{'rows/s':>13}{'peak MB':>9}"
+          f"{'read':>8}{'exec':>8}{'fold':>8}{'threads':>8}{'workers':>8}")
+
+    results = []
+    for rows in args.rows:
+        path = ensure_data(rows)
+        for mode in args.modes:
+            for chunk_size in args.chunk_sizes if mode in CHUNKED_MODES else [None]:
+                config = {
+                    "file": path, "rows": rows, "mode": mode, "chunk_size": chunk_size,
+                    "workers": args.workers, "memory_budget": args.memory_budget, "group_by": group_by
+                }
+                if mode == "sidecar":
+                    # Build the sidecar first so the timed run only reads it
+                    spawn({**config, "mode": "sidecar", "group_by": []})
+                result = spawn(config)
+                results.append(result)
+                cpu = result["cpu_s"]
+                print(f"{rows:>12,} {mode:<9}{chunk_size or '-':>9}{result['wall_s']:>9.2f}"
+                      f"{result['rows_per_s']:>13,.0f}{result['peak_rss_mb']:>9.0f}"
+                      f"{cpu['read']:>8.2f}{cpu['exec']:>8.2f}{cpu['fold']:>8.2f}"
+                      f"{cpu['other_threads']:>8.2f}{cpu['workers']:>8.2f}", flush=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,61 @@
 from pocketflow import Flow, Node
-from nodes import CSVProcessor
+from nodes import CSVProcessor, ParallelCSVProcessor
+from utils.chunking import AdaptiveChunkSizer
 
 class ShowStats(Node):
     """Node to display the final statistics."""
     
     def prep(self, shared):
         """Get statistics from shared store."""
-        return shared["statistics"]
+        return shared["statistics"], shared.get("grouped_statistics", {})
     
     def post(self, shared, prep_res, exec_res):
         """Display the statistics."""
-        stats = prep_res
+        stats, grouped = prep_res
         print("\nFinal Statistics:")
         print(f"- Total Sales: ${stats['total_sales']:,.2f}")
         print(f"- Average Sale: ${stats['average_sale']:,.2f}")
+        print(f"- Sale Range: ${stats['min_sale']:,.2f} to ${stats['max_sale']:,.2f}")
         print(f"- Total Transactions: {stats['total_transactions']:,}\n")
+        
+        if "product" in grouped:
+            print("Per-Product Statistics:")
+            print(f"{'Product':<10}{'Count':>8}{'Total':>14}{'Mean':>10}{'Std':>10}{'p50':>10}{'p95':>10}")
+            for product, g in grouped["product"].items():
+                print(f"{product:<10}{g['count']:>8,}{g['total']:>14,.2f}{g['mean']:>10.2f}"
+                      f"{g['std']:>10.2f}{g['p50']:>10.2f}{g['p95']:>10.2f}")
+            print()
         return "end"
 
-def create_flow():
-    """Create and return the processing flow."""
+def create_flow(chunk_size=1000, engine="c", parallel=False, workers=None, group_by=("product",),
+                sidecar=None, memory_budget=None, checkpoints=None):
+    """Create and return the processing flow.
+    
+    Args:
+        chunk_size: Rows per chunk, ignored when memory_budget is set
+        engine: CSV parser, "c" (pandas) or "pyarrow" (needs pyarrow installed)
+        parallel: Parse newline-aligned byte ranges in worker processes
+            instead of reading chunks sequentially
+        workers: Number of worker processes (default: all cores)
+        group_by: Groupings to compute per-group statistics for,
+            any of "product" and "date" (per day; opt in, as it is far
+            slower with many days); () for global statistics only
+        sidecar: Optional ColumnarSidecar for sequential mode, so repeated
+            runs read memory-mapped columns instead of parsing the CSV
+        memory_budget: Bytes of memory a chunk may use; enables adaptive
+            chunk sizing in sequential mode (see utils.chunking)
+        checkpoints: Optional CheckpointStore; every chunk's partial result
+            is stored so a failed run resumes where it stopped
+    """
     # Create nodes
-    processor = CSVProcessor(chunk_size=1000)
+    if parallel:
+        processor = ParallelCSVProcessor(workers=workers, engine=engine, group_by=group_by, checkpoints=checkpoints)
+    else:
+        if memory_budget:
+            chunk_size = AdaptiveChunkSizer(memory_budget)
+        processor = CSVProcessor(
+            chunk_size=chunk_size, engine=engine, group_by=group_by, sidecar=sidecar, checkpoints=checkpoints
+        )
     show_stats = ShowStats()
     
     # Connect nodes
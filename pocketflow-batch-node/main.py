@@ -1,5 +1,8 @@
 import os
 from flow import create_flow
+from utils.checkpoint import CheckpointStore
+from utils.generate import generate_sales
+from utils.sidecar import ColumnarSidecar
 
 def main():
     """Run the batch processing example."""
@@ -9,18 +12,7 @@ def main():
     # Create sample CSV if it doesn't exist
     if not os.path.exists("data/sales.csv"):
         print("Creating sample sales.csv...")
-        import pandas as pd
-        import numpy as np
-        
-        # Generate sample data
-        np.random.seed(42)
-        n_rows = 10000
-        df = pd.DataFrame({
-            "date": pd.date_range("2024-01-01", periods=n_rows),
-            "amount": np.random.normal(100, 30, n_rows).round(2),
-            "product": np.random.choice(["A", "B", "C"], n_rows)
-        })
-        df.to_csv("data/sales.csv", index=False)
+        generate_sales("data/sales.csv", rows=10000)
     
     # Initialize shared store
     shared = {
@@ -29,7 +21,12 @@ def main():
     
     # Create and run flow
     print(f"Processing sales.csv in chunks...")
-    flow = create_flow()
+    # Later runs read memory-mapped columns from .csv_cache instead of parsing,
+    # chunk sizes are tuned within a 64 MiB budget (remembered across runs),
+    # and an interrupted run resumes from the chunks checkpointed so far
+    flow = create_flow(
+        sidecar=ColumnarSidecar(), memory_budget=64 * 2**20, checkpoints=CheckpointStore()
+    )
     flow.run(shared)
 
 if __name__ == "__main__":
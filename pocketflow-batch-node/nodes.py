@@ -1,61 +1,202 @@
-import pandas as pd
+from functools import reduce, partial
+from concurrent.futures import ProcessPoolExecutor
 from pocketflow import BatchNode
+from utils.aggregate import read_chunks
+from utils.checkpoint import completed_prefix
+from utils.chunking import AdaptiveChunkSizer
+from utils.grouped import SalesSummary, sales_columns
+from utils.ranges import split_byte_ranges, aggregate_range
 
-class CSVProcessor(BatchNode):
+class ReduceBatchNode(BatchNode):
+    """BatchNode that folds each exec result into a running accumulator.
+    
+    A plain BatchNode collects every exec result into a list before post
+    runs. Here each result is passed to fold() as soon as it is produced and
+    then dropped, so memory stays O(1) in the number of items when prep
+    returns an iterator. post receives the final accumulator instead of a
+    list.
+    """
+    
+    def initial(self):
+        """Return the accumulator before any item has been processed."""
+        return None
+    
+    def fold(self, acc, exec_res):
+        """Combine one exec result into the accumulator and return it.
+        
+        By default exec results are mergeable summaries (SalesStats,
+        SalesSummary, ...): the first becomes the accumulator and later ones
+        are merged into it.
+        """
+        return exec_res if acc is None else acc.merge(exec_res)
+    
+    def _exec(self, items):
+        acc = self.initial()
+        for item in items or []:
+            # Node._exec runs exec with the node's retry and fallback handling
+            acc = self.fold(acc, super(BatchNode, self)._exec(item))
+        return acc
+
+def with_offsets(chunks, offset=0):
+    """Pair each chunk with the row offset of its first row."""
+    for chunk in chunks:
+        yield offset, chunk
+        offset += len(chunk)
+
+def aggregate_item(byte_range, columns, engine, group_by):
+    """Aggregate one (path, start, end, header) range into (start, length, summary).
+
+    Module-level so ProcessPoolExecutor can pickle it.
+    """
+    path, start, end, header = byte_range
+    return start, end - start, aggregate_range(path, start, end, header, columns, engine, group_by)
+
+class CSVProcessor(ReduceBatchNode):
     """BatchNode that processes a large CSV file in chunks."""
     
-    def __init__(self, chunk_size=1000):
-        """Initialize with chunk size."""
+    def __init__(self, chunk_size=1000, engine="c", group_by=("product",), sidecar=None,
+                 checkpoints=None):
+        """Initialize with chunk size (rows, or an AdaptiveChunkSizer), CSV
+        engine ("c" or "pyarrow"), the groupings to compute per-group
+        statistics for, an optional ColumnarSidecar that replaces text
+        parsing on repeated runs and an optional CheckpointStore that lets
+        a failed run resume."""
         super().__init__()
         self.chunk_size = chunk_size
+        self.engine = engine
+        self.group_by = tuple(group_by)
+        self.columns = sales_columns(self.group_by)
+        self.sidecar = sidecar
+        self.checkpoints = checkpoints
+        self.job, self.resumed = None, []
     
     def prep(self, shared):
         """Split CSV file into chunks.
         
-        Returns an iterator of DataFrames, each containing chunk_size rows.
+        Returns an iterator of (row offset, DataFrame) pairs, each DataFrame
+        containing up to chunk_size rows of only the columns the statistics
+        use, parsed with explicit dtypes. With a sidecar, chunks come from
+        memory-mapped columns once the sidecar has been built. With
+        checkpoints, rows already covered by a failed run are skipped.
         """
-        # Read CSV in chunks
-        chunks = pd.read_csv(
-            shared["input_file"],
-            chunksize=self.chunk_size
-        )
-        return chunks
-    
-    def exec(self, chunk):
+        path = shared["input_file"]
+        skip_rows = 0
+        if self.checkpoints is not None:
+            self.job = self.checkpoints.job_key(
+                path, mode="rows", columns=list(self.columns), group_by=list(self.group_by)
+            )
+            self.resumed, skip_rows = completed_prefix(self.checkpoints.load(self.job))
+            if skip_rows:
+                print(f"Resuming after {skip_rows:,} checkpointed rows")
+        
+        if isinstance(self.chunk_size, AdaptiveChunkSizer):
+            self.chunk_size.start(path, self.columns)
+        if self.sidecar is not None:
+            chunks = self.sidecar.read_chunks(path, self.chunk_size, self.columns, self.engine, skip_rows)
+        else:
+            # Read CSV in chunks
+            chunks = read_chunks(path, self.chunk_size, self.columns, self.engine, skip_rows)
+        return with_offsets(chunks, skip_rows)
+    
+    def exec(self, item):
         """Process a single chunk of the CSV.
         
         Args:
-            chunk: pandas DataFrame containing chunk_size rows
+            item: (row offset, pandas DataFrame containing chunk_size rows)
             
         Returns:
-            dict: Statistics for this chunk
+            tuple: (row offset, row count, SalesSummary of this chunk)
         """
-        return {
-            "total_sales": chunk["amount"].sum(),
-            "num_transactions": len(chunk),
-            "total_amount": chunk["amount"].sum()
-        }
+        offset, chunk = item
+        return offset, len(chunk), SalesSummary.from_frame(chunk, self.group_by)
+    
+    def initial(self):
+        """Start from empty statistics, or from the partials of a resumed run."""
+        return reduce(SalesSummary.merge, self.resumed, SalesSummary())
     
-    def post(self, shared, prep_res, exec_res_list):
-        """Combine results from all chunks.
+    def fold(self, summary, chunk_res):
+        """Checkpoint one chunk's statistics and merge them into the running total."""
+        offset, length, chunk_summary = chunk_res
+        if self.checkpoints is not None:
+            self.checkpoints.save(self.job, offset, length, chunk_summary)
+        return summary.merge(chunk_summary)
+    
+    def post(self, shared, prep_res, summary):
+        """Store the final statistics.
         
         Args:
             prep_res: Original chunks iterator
-            exec_res_list: List of results from each chunk
+            summary: SalesSummary folded over every chunk
             
         Returns:
             str: Action to take next
         """
-        # Combine statistics from all chunks
-        total_sales = sum(res["total_sales"] for res in exec_res_list)
-        total_transactions = sum(res["num_transactions"] for res in exec_res_list)
-        total_amount = sum(res["total_amount"] for res in exec_res_list)
+        # The job finished, so its partials are no longer needed
+        if self.checkpoints is not None:
+            self.checkpoints.clear(self.job)
+        if isinstance(self.chunk_size, AdaptiveChunkSizer):
+            self.chunk_size.finish()
+            shared["chunk_sizes"] = self.chunk_size.sizes
         
         # Calculate final statistics
-        shared["statistics"] = {
-            "total_sales": total_sales,
-            "average_sale": total_amount / total_transactions,
-            "total_transactions": total_transactions
-        }
+        shared["statistics"] = summary.stats.to_dict()
+        shared["grouped_statistics"] = {by: grouped.to_dict() for by, grouped in summary.grouped.items()}
+        
+        return "show_stats" 
+
+class ParallelCSVProcessor(CSVProcessor):
+    """CSVProcessor that parses byte ranges of the file in worker processes.
+    
+    Instead of one pandas parser reading the file front to back, the file is
+    split into newline-aligned byte ranges and every range is parsed and
+    aggregated in a separate process. The partial SalesSummary objects are folded into
+    the running total as they arrive, exactly as for sequential chunks.
+    """
+    
+    def __init__(self, workers=None, range_bytes=16 * 2**20, engine="c", group_by=("product",),
+                 checkpoints=None):
+        """Initialize with worker count (default: all cores), target range size,
+        CSV engine, groupings and an optional CheckpointStore."""
+        super().__init__(engine=engine, group_by=group_by, checkpoints=checkpoints)
+        self.workers = workers
+        self.range_bytes = range_bytes
+    
+    def prep(self, shared):
+        """Split the CSV file into newline-aligned byte ranges.
+        
+        Returns a list of (path, start, end, header) tuples. With
+        checkpoints, ranges completed by a failed run are left out.
+        """
+        path = shared["input_file"]
+        header, ranges = split_byte_ranges(path, self.range_bytes)
+        if self.checkpoints is not None:
+            self.job = self.checkpoints.job_key(
+                path, mode="bytes", range_bytes=self.range_bytes,
+                columns=list(self.columns), group_by=list(self.group_by)
+            )
+            # Ranges finish out of order, so any stored range can be reused
+            done = {(offset, offset + length): summary for offset, length, summary in self.checkpoints.load(self.job)}
+            self.resumed = [done[r] for r in ranges if r in done]
+            ranges = [r for r in ranges if r not in done]
+            if self.resumed:
+                print(f"Resuming after {len(self.resumed)} checkpointed byte ranges")
+        return [(path, start, end, header) for start, end in ranges]
+    
+    def exec(self, byte_range):
+        """Parse and aggregate a single byte range in this process."""
+        return aggregate_item(byte_range, self.columns, self.engine, self.group_by)
+    
+    def _exec(self, items):
+        """Aggregate every range on a process pool and fold results in range order.
         
-        return "show_stats" 
\ No newline at end of file
+        The pool runs aggregate_item, the same function as exec, because the
+        node itself (and its checkpoint store) cannot be pickled. As a result
+        max_retries and exec_fallback do not apply: a failed range raises
+        out of the pool.
+        """
+        acc = self.initial()
+        task = partial(aggregate_item, columns=self.columns, engine=self.engine, group_by=self.group_by)
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for range_res in pool.map(task, items or []):
+                acc = self.fold(acc, range_res)
+        return acc
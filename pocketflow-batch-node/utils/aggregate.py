@@ -0,0 +1,166 @@
+"""Column-pruned CSV chunk reading and mergeable sales statistics."""
+
+import io
+import itertools
+import numpy as np
+import pandas as pd
+
+# Columns the statistics read, with explicit dtypes so pandas never has to
+# infer them (and never parses the columns that are not listed)
+SALES_COLUMNS = {"amount": "float64"}
+
+class SalesStats:
+    """Mergeable summary of sale amounts.
+    
+    Built from one chunk with from_values() and combined with merge(), so
+    chunks can be aggregated in any order and in any process.
+    """
+    
+    def __init__(self, count=0, total=0.0, minimum=np.inf, maximum=-np.inf):
+        self.count = count
+        self.total = total
+        self.minimum = minimum
+        self.maximum = maximum
+    
+    @classmethod
+    def from_values(cls, values):
+        """Summarize one chunk's amounts with vectorized NumPy reductions.
+        
+        Blank or unparseable amounts (NaN) are skipped, as pandas' sum()
+        did, and are not counted as transactions.
+        
+        Args:
+            values: 1-D float64 NumPy array of sale amounts
+        """
+        missing = np.isnan(values)
+        if missing.any():
+            values = values[~missing]
+        if len(values) == 0:
+            return cls()
+        return cls(len(values), float(values.sum()), float(values.min()), float(values.max()))
+    
+    def merge(self, other):
+        """Return the summary of both inputs combined."""
+        return SalesStats(
+            self.count + other.count,
+            self.total + other.total,
+            min(self.minimum, other.minimum),
+            max(self.maximum, other.maximum)
+        )
+    
+    def to_dict(self):
+        """Final statistics, as stored in shared["statistics"]."""
+        return {
+            "total_sales": self.total,
+            "average_sale": self.total / self.count if self.count else 0.0,
+            "total_transactions": self.count,
+            "min_sale": self.minimum if self.count else 0.0,
+            "max_sale": self.maximum if self.count else 0.0
+        }
+
+def read_chunks(path, chunk_size, columns=SALES_COLUMNS, engine="c", skip_rows=0):
+    """Yield DataFrames of at most chunk_size rows with only the given columns.
+    
+    Args:
+        path: CSV file path
+        chunk_size: Rows per chunk, or a callable that takes the previous
+            chunk's row count (0 at first) and returns the next chunk's,
+            such as utils.chunking.AdaptiveChunkSizer
+        columns: Mapping of column name to dtype; other columns are skipped
+            by the parser rather than loaded and dropped
+        engine: "c" for pandas' parser, or "pyarrow" for Arrow's
+            multithreaded streaming CSV reader (requires pyarrow)
+        skip_rows: Number of data rows to skip before the first chunk
+    """
+    if engine == "c":
+        yield from _read_chunks_pandas(path, chunk_size, columns, skip_rows)
+    elif engine == "pyarrow":
+        yield from _read_chunks_arrow(path, chunk_size, columns, skip_rows)
+    else:
+        raise ValueError(f"Unknown CSV engine: {engine}")
+
+def next_chunk_size(chunk_size, previous_rows):
+    """Resolve a fixed or callable chunk_size for the next chunk."""
+    return chunk_size(previous_rows) if callable(chunk_size) else chunk_size
+
+def _read_chunks_pandas(path, chunk_size, columns, skip_rows=0):
+    """Read chunks with pandas' C parser, asking for each chunk's size in turn."""
+    with open(path, "rb") as f:
+        options = {}
+        if skip_rows:
+            # Skip whole lines without tokenizing them (assumes no quoted newlines)
+            options = {"header": None, "names": f.readline().decode().strip().split(",")}
+            for _ in itertools.islice(f, skip_rows):
+                pass
+        with pd.read_csv(f, usecols=list(columns), dtype=columns, iterator=True, **options) as reader:
+            rows = 0
+            while True:
+                try:
+                    chunk = reader.get_chunk(next_chunk_size(chunk_size, rows))
+                except StopIteration:
+                    return
+                rows = len(chunk)
+                if not rows:
+                    return  # Every row was skipped
+                yield chunk
+
+def parse_csv_bytes(data, header, columns=SALES_COLUMNS, engine="c"):
+    """Parse a headerless block of CSV rows into a DataFrame.
+    
+    Args:
+        data: Bytes holding complete CSV lines
+        header: Column names of the file
+        columns: Mapping of column name to dtype to parse
+        engine: "c" or "pyarrow"
+    """
+    if engine == "c":
+        return pd.read_csv(io.BytesIO(data), header=None, names=header, usecols=list(columns), dtype=columns)
+    elif engine == "pyarrow":
+        pa, csv = _import_arrow()
+        table = csv.read_csv(
+            pa.py_buffer(data),
+            read_options=csv.ReadOptions(column_names=header),
+            convert_options=_arrow_convert_options(pa, csv, columns)
+        )
+        return table.to_pandas()
+    else:
+        raise ValueError(f"Unknown CSV engine: {engine}")
+
+def _import_arrow():
+    """Import pyarrow lazily, since it is an optional dependency."""
+    try:
+        import pyarrow as pa
+        from pyarrow import csv
+    except ImportError:
+        raise ImportError("engine='pyarrow' requires pyarrow: pip install pyarrow")
+    return pa, csv
+
+def _arrow_convert_options(pa, csv, columns):
+    """Arrow options that parse only the given columns, with their dtypes."""
+    return csv.ConvertOptions(
+        include_columns=list(columns),
+        column_types={name: pa.from_numpy_dtype(np.dtype(dtype)) for name, dtype in columns.items()}
+    )
+
+def _read_chunks_arrow(path, chunk_size, columns, skip_rows=0):
+    """Stream record batches with pyarrow and re-slice them to chunk_size rows."""
+    pa, csv = _import_arrow()
+    reader = csv.open_csv(
+        path,
+        read_options=csv.ReadOptions(skip_rows_after_names=skip_rows),
+        convert_options=_arrow_convert_options(pa, csv, columns)
+    )
+    # Chunks may span record batches; slicing a Table of buffered batches is zero-copy
+    buffered, rows = [], 0
+    size = next_chunk_size(chunk_size, 0)
+    for batch in reader:
+        buffered.append(batch)
+        rows += batch.num_rows
+        while rows >= size:
+            table = pa.Table.from_batches(buffered)
+            chunk = table.slice(0, size).to_pandas()
+            buffered, rows = table.slice(size).to_batches(), rows - size
+            yield chunk
+            size = next_chunk_size(chunk_size, len(chunk))
+    if rows:
+        yield pa.Table.from_batches(buffered).to_pandas()
@@ -0,0 +1,83 @@
+"""SQLite store of per-chunk partial results, for resuming failed runs.
+
+Every chunk's partial SalesSummary is pickled into one row keyed by the job
+(the source file's path, size and mtime plus the settings that shape the
+partials) and the chunk's offset: a row offset for sequential chunks, a byte
+offset for parallel byte ranges. A restarted run loads the stored partials,
+merges them, and only processes what is missing. A changed source file gets
+a different job key, so stale partials are never reused.
+"""
+
+import os
+import json
+import pickle
+import sqlite3
+import hashlib
+
+class CheckpointStore:
+    """Partial results of chunked jobs, committed one chunk at a time."""
+
+    def __init__(self, path=".checkpoints.sqlite"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        # WAL keeps per-chunk commits cheap while staying crash-safe
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS partials (
+                job TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                state BLOB NOT NULL,
+                PRIMARY KEY (job, offset)
+            )
+        """)
+        self.conn.commit()
+
+    def job_key(self, path, **settings):
+        """Identify a job by its source file's identity and its settings."""
+        stat = os.stat(path)
+        identity = {
+            "file": os.path.abspath(path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "settings": settings
+        }
+        return hashlib.sha1(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+    def load(self, job):
+        """Return the job's stored (offset, length, partial) tuples by offset."""
+        rows = self.conn.execute(
+            "SELECT offset, length, state FROM partials WHERE job = ? ORDER BY offset", (job,)
+        )
+        return [(offset, length, pickle.loads(state)) for offset, length, state in rows]
+
+    def save(self, job, offset, length, partial):
+        """Durably store one chunk's partial result."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO partials VALUES (?, ?, ?, ?)",
+            (job, offset, length, pickle.dumps(partial, pickle.HIGHEST_PROTOCOL))
+        )
+        self.conn.commit()
+
+    def clear(self, job):
+        """Drop a finished job's partials."""
+        self.conn.execute("DELETE FROM partials WHERE job = ?", (job,))
+        self.conn.commit()
+        # Give the space back once no job is in progress
+        if self.conn.execute("SELECT 1 FROM partials LIMIT 1").fetchone() is None:
+            self.conn.execute("VACUUM")
+
+def completed_prefix(partials):
+    """Split sequential partials into the contiguous run from row 0 and its length.
+
+    Sequential chunks are committed in order, but chunk sizes may differ
+    between runs, so only the unbroken prefix is trusted.
+    """
+    done, rows = [], 0
+    for offset, length, partial in partials:
+        if offset != rows:
+            break
+        done.append(partial)
+        rows += length
+    return done, rows
@@ -0,0 +1,166 @@
+"""Adaptive chunk sizing under a memory budget.
+
+An AdaptiveChunkSizer is passed as the chunk_size of read_chunks or
+ColumnarSidecar.read_chunks. The reader calls it before every chunk with the
+row count of the previous chunk. The sizer times each chunk round trip
+(parse, exec and fold) and measures the process RSS growth across it,
+against the RSS sampled just before that chunk:
+
+- The first chunk size is estimated from the file's average line length and
+  the parsed width of the columns, or taken from the history of earlier
+  runs on the same file.
+- While rows per second keep improving by more than 5%, the size doubles,
+  as long as the RSS growth of a doubled chunk would stay within the budget.
+- Once throughput stops improving, the size settles on the best one seen.
+- If the RSS growth ever exceeds the budget, the size is halved.
+
+RSS comes from /proc, else psutil, else the peak RSS from the resource
+module. Where none is available (Windows without psutil), the memory signal
+is off and only throughput steers the size, within min_rows and max_rows.
+
+The settled size is written to a JSON history keyed by file, columns and
+budget, so later runs start near the optimum. `sizes` records only the
+changes, as (chunk index, new size) pairs, so it stays small however many
+chunks are read.
+"""
+
+import os
+import sys
+import json
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:  # Optional, only used where procfs is missing
+    psutil = None
+
+# Parsed bytes per value: a number, or a Python string object and its pointer
+_NUMBER_BYTES = 8
+_STRING_BYTES = 64
+
+# Parsed frames plus parser buffers and exec temporaries, per raw row
+_OVERHEAD = 4
+
+def current_rss():
+    """Resident set size of this process in bytes, or None if unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    if resource is not None:
+        # Fall back to the peak RSS (kilobytes on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    return None
+
+def estimate_row_bytes(path, columns, sample_bytes=1 << 16):
+    """Estimate the memory one row of path costs while it is being processed.
+
+    Args:
+        path: CSV file path
+        columns: Mapping of column name to dtype that will be parsed
+        sample_bytes: How much of the file to sample for the line length
+    """
+    with open(path, "rb") as f:
+        f.readline()  # Header
+        sample = f.read(sample_bytes)
+    lines = sample.count(b"\n")
+    line_bytes = len(sample) / lines if lines else len(sample) or 1
+    parsed_bytes = sum(_NUMBER_BYTES if dtype != "str" else _STRING_BYTES for dtype in columns.values())
+    return int((line_bytes + parsed_bytes) * _OVERHEAD)
+
+class AdaptiveChunkSizer:
+    """Callable chunk size that tunes itself for throughput within a memory budget."""
+
+    def __init__(self, memory_budget=64 * 2**20, history_path=".chunk_sizes.json",
+                 min_rows=1000, max_rows=10_000_000):
+        """Initialize the sizer.
+
+        Args:
+            memory_budget: Bytes of RSS growth allowed while processing a chunk
+            history_path: JSON file of settled sizes from earlier runs, or None
+            min_rows, max_rows: Bounds for the chunk size
+        """
+        self.memory_budget = memory_budget
+        self.history_path = history_path
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.size = min_rows
+
+    def _clamp(self, rows):
+        return max(self.min_rows, min(self.max_rows, int(rows)))
+
+    def _load_history(self):
+        if not self.history_path:
+            return {}
+        try:
+            with open(self.history_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def start(self, path, columns):
+        """Reset for a run over path and pick the first chunk size."""
+        self._key = f"{os.path.abspath(path)}|{','.join(columns)}|{self.memory_budget}"
+        remembered = self._load_history().get(self._key)
+        if remembered:
+            self.size = self._clamp(remembered)
+        else:
+            self.size = self._clamp(self.memory_budget // estimate_row_bytes(path, columns))
+
+        self.best_size, self.best_throughput = self.size, 0.0
+        self.sizes = []
+        self._chunks = 0
+        self._growing = True
+        self._baseline = current_rss()
+        self._last = time.perf_counter()
+
+    def __call__(self, previous_rows):
+        """Return the next chunk size, given the previous chunk's row count."""
+        now = time.perf_counter()
+        # The short last chunk says nothing about the chosen size
+        if previous_rows and previous_rows == self.size:
+            rss = current_rss()
+            # Without any RSS source the memory signal is off and only throughput counts
+            rss_growth = rss - self._baseline if rss is not None and self._baseline is not None else 0
+            self._observe(previous_rows / max(now - self._last, 1e-9), rss_growth)
+        if not self.sizes or self.sizes[-1][1] != self.size:
+            self.sizes.append((self._chunks, self.size))
+        self._chunks += 1
+        # Growth is measured per chunk, so the accumulator's growth is not counted
+        self._baseline = current_rss()
+        self._last = time.perf_counter()
+        return self.size
+
+    def _observe(self, throughput, rss_growth):
+        """Adjust the size after a full chunk."""
+        if rss_growth > self.memory_budget:
+            self.size = self._clamp(self.size // 2)
+            self.best_size = min(self.best_size, self.size)
+            self._growing = False
+        elif throughput > self.best_throughput * 1.05:
+            self.best_size, self.best_throughput = self.size, throughput
+            if self._growing and 2 * rss_growth <= self.memory_budget:
+                self.size = self._clamp(self.size * 2)
+        elif self._growing:
+            self.size = self.best_size
+            self._growing = False
+
+    def finish(self):
+        """Record the settled size for later runs."""
+        if not self.history_path:
+            return
+        history = self._load_history()
+        history[self._key] = self.best_size
+        tmp = f"{self.history_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(history, f, indent=1)
+        os.replace(tmp, self.history_path)
@@ -0,0 +1,94 @@
+"""Streaming generator for synthetic sales CSV files of any size.
+
+Rows are produced in fixed-size blocks. Each block gets its own random
+stream, seeded by (seed, block index), so the file's contents depend only
+on the seed, the row count and the block size, not on how the blocks are
+spread over worker processes. Each shard (a contiguous run of blocks) is written to its own part
+file by a worker process, holding one block in memory at a time. The parts
+are then appended to the header in order. Dates wrap around within one year,
+so every row count gives valid dates.
+
+Blocks are formatted with pyarrow's CSV writer when it is installed (about
+10x faster than DataFrame.to_csv), else with pandas.
+"""
+
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+PRODUCTS = ("A", "B", "C")
+
+# One year of ISO dates, looked up rather than formatted per row
+_DAYS = np.datetime_as_string(np.arange("2024-01-01", "2025-01-01", dtype="datetime64[D]"))
+
+def sales_block(block, block_rows, total_rows, seed=42):
+    """Return block number `block` of the file as a DataFrame."""
+    start = block * block_rows
+    rows = min(block_rows, total_rows - start)
+    rng = np.random.default_rng([seed, block])
+    return pd.DataFrame({
+        "date": _DAYS[np.arange(start, start + rows) % len(_DAYS)],
+        "amount": rng.normal(100, 30, rows).round(2),
+        "product": np.asarray(PRODUCTS)[rng.integers(len(PRODUCTS), size=rows)]
+    })
+
+def _write_block(f, frame):
+    """Append a block's rows, without a header, to a binary file."""
+    try:
+        import pyarrow as pa
+        from pyarrow import csv
+    except ImportError:
+        frame.to_csv(f, header=False, index=False)
+        return
+    csv.write_csv(
+        pa.Table.from_pandas(frame, preserve_index=False), f,
+        csv.WriteOptions(include_header=False, quoting_style="none")
+    )
+
+def _write_shard(part_path, blocks, block_rows, total_rows, seed):
+    """Write a run of blocks to one part file, one block in memory at a time."""
+    with open(part_path, "wb") as f:
+        for block in blocks:
+            _write_block(f, sales_block(block, block_rows, total_rows, seed))
+    return part_path
+
+def generate_sales(path, rows, shards=None, block_rows=1_000_000, seed=42):
+    """Write a sales CSV with `rows` rows (date, amount, product).
+
+    Args:
+        path: Output CSV path
+        rows: Number of data rows
+        shards: Worker processes (default: all cores, at most one per block)
+        block_rows: Rows generated and held in memory at once per worker
+        seed: Random seed; the same seed, rows and block_rows give the same file
+    """
+    blocks = -(-rows // block_rows)
+    shards = max(1, min(shards or os.cpu_count() or 1, blocks))
+    # Contiguous block runs, so concatenating the parts keeps row order
+    bounds = np.linspace(0, blocks, shards + 1).astype(int)
+    parts = [f"{path}.part{i}" for i in range(shards)]
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    try:
+        if shards == 1:
+            _write_shard(parts[0], range(blocks), block_rows, rows, seed)
+        else:
+            with ProcessPoolExecutor(max_workers=shards) as pool:
+                list(pool.map(
+                    _write_shard, parts, [range(a, b) for a, b in zip(bounds, bounds[1:])],
+                    [block_rows] * shards, [rows] * shards, [seed] * shards
+                ))
+
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as out:
+            out.write(b"date,amount,product\n")
+            for part in parts:
+                with open(part, "rb") as f:
+                    shutil.copyfileobj(f, out, 16 * 2**20)
+        os.replace(tmp, path)
+    finally:
+        for part in parts:
+            if os.path.exists(part):
+                os.remove(part)
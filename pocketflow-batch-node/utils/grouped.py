@@ -0,0 +1,158 @@
+"""Mergeable per-group sales statistics (by product, by day).
+
+Each chunk is grouped with one factorize and a handful of bincount/reduceat
+calls over the sorted amounts, giving per-group partial states: count, sum,
+mean and sum of squared deviations (for variance), min, max and a KLL
+quantile sketch. Partial states combine with Chan et al.'s parallel update
+for the moments, so chunks and worker results can be merged in any order
+with no second pass over the data.
+"""
+
+import numpy as np
+import pandas as pd
+from utils.aggregate import SalesStats
+from utils.sketch import QuantileSketch
+
+def _day(frame):
+    """Calendar day of each row, from date strings or parsed datetimes."""
+    dates = frame["date"]
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates.to_numpy().astype("datetime64[D]")
+    return dates.str[:10]
+
+# How each supported grouping derives its key from a chunk
+GROUP_KEYS = {
+    "product": lambda frame: frame["product"],
+    "date": _day
+}
+
+def sales_columns(group_by=()):
+    """Columns (and dtypes) to parse for the global and grouped statistics."""
+    columns = {"amount": "float64"}
+    for name in group_by:
+        if name not in GROUP_KEYS:
+            raise ValueError(f"Unknown grouping: {name}")
+        columns[name] = "str"
+    return columns
+
+class GroupStats:
+    """Mergeable statistics of one group's amounts."""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, minimum=np.inf, maximum=-np.inf, sketch=None):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2  # Sum of squared deviations from the mean
+        self.minimum = minimum
+        self.maximum = maximum
+        self.sketch = sketch if sketch is not None else QuantileSketch()
+
+    def merge(self, other):
+        """Return the statistics of both groups combined."""
+        if not other.count:
+            return self
+        if not self.count:
+            return other
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        return GroupStats(
+            count,
+            self.mean + delta * other.count / count,
+            self.m2 + other.m2 + delta * delta * self.count * other.count / count,
+            min(self.minimum, other.minimum),
+            max(self.maximum, other.maximum),
+            self.sketch.merge(other.sketch)
+        )
+
+    def to_dict(self, quantiles=(0.5, 0.95)):
+        """Final statistics, including the estimated quantiles."""
+        stats = {
+            "count": self.count,
+            "total": self.mean * self.count,
+            "mean": self.mean,
+            "std": float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else 0.0,
+            "min": self.minimum,
+            "max": self.maximum
+        }
+        for q, value in zip(quantiles, self.sketch.quantiles(quantiles)):
+            stats[f"p{round(q * 100):g}"] = value
+        return stats
+
+class GroupedStats:
+    """Mapping of group key to GroupStats for one grouping."""
+
+    def __init__(self, by, groups=None):
+        self.by = by
+        self.groups = groups or {}
+
+    @classmethod
+    def from_frame(cls, frame, by):
+        """Summarize one chunk's amounts per group in a vectorized pass.
+
+        Args:
+            frame: DataFrame with an amount column and the grouping column
+            by: Name of the grouping in GROUP_KEYS
+        """
+        values = frame["amount"].to_numpy()
+        missing = np.isnan(values)
+        if missing.any():
+            # Rows without an amount are skipped, as in SalesStats.from_values
+            frame, values = frame[~missing], values[~missing]
+        codes, keys = pd.factorize(GROUP_KEYS[by](frame))
+        if len(keys) == 0:
+            return cls(by)
+        if keys.dtype.kind == "M":
+            # Parsed days get the same string keys as unparsed ones
+            keys = np.datetime_as_string(keys, unit="D")
+
+        counts = np.bincount(codes, minlength=len(keys))
+        means = np.bincount(codes, weights=values, minlength=len(keys)) / counts
+        m2s = np.bincount(codes, weights=(values - means[codes]) ** 2, minlength=len(keys))
+
+        # Sort the amounts by group so min, max and the sketches see contiguous runs
+        ordered = values[np.argsort(codes, kind="stable")]
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        minimums = np.minimum.reduceat(ordered, starts)
+        maximums = np.maximum.reduceat(ordered, starts)
+
+        groups = {}
+        for i, key in enumerate(keys):
+            sketch = QuantileSketch()
+            sketch.update(ordered[starts[i]:starts[i] + counts[i]])
+            groups[key] = GroupStats(
+                int(counts[i]), float(means[i]), float(m2s[i]),
+                float(minimums[i]), float(maximums[i]), sketch
+            )
+        return cls(by, groups)
+
+    def merge(self, other):
+        """Return the per-group statistics of both inputs combined."""
+        groups = dict(self.groups)
+        for key, stats in other.groups.items():
+            groups[key] = groups[key].merge(stats) if key in groups else stats
+        return GroupedStats(self.by, groups)
+
+    def to_dict(self, quantiles=(0.5, 0.95)):
+        """Final statistics per group, sorted by key."""
+        return {key: self.groups[key].to_dict(quantiles) for key in sorted(self.groups)}
+
+class SalesSummary:
+    """Global SalesStats plus a GroupedStats for every requested grouping."""
+
+    def __init__(self, stats=None, grouped=None):
+        self.stats = stats or SalesStats()
+        self.grouped = grouped or {}
+
+    @classmethod
+    def from_frame(cls, frame, group_by=()):
+        """Summarize one chunk."""
+        return cls(
+            SalesStats.from_values(frame["amount"].to_numpy()),
+            {by: GroupedStats.from_frame(frame, by) for by in group_by}
+        )
+
+    def merge(self, other):
+        """Return the summary of both inputs combined."""
+        grouped = dict(self.grouped)
+        for by, stats in other.grouped.items():
+            grouped[by] = grouped[by].merge(stats) if by in grouped else stats
+        return SalesSummary(self.stats.merge(other.stats), grouped)
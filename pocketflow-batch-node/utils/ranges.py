@@ -0,0 +1,57 @@
+"""Newline-aligned byte ranges of a CSV file, parsed independently.
+
+Each range starts at the beginning of a line and ends just after a newline,
+so ranges can be parsed by separate worker processes with no coordination
+and without any row being split or counted twice. Fields with embedded
+(quoted) newlines are not supported.
+"""
+
+import os
+from utils.aggregate import SALES_COLUMNS, parse_csv_bytes
+from utils.grouped import SalesSummary
+
+def split_byte_ranges(path, range_bytes):
+    """Split a CSV file's data rows into newline-aligned ranges.
+    
+    Args:
+        path: CSV file path (first line is the header)
+        range_bytes: Target size of each range
+        
+    Returns:
+        tuple: (column names from the header, list of (start, end) offsets)
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header = f.readline()
+        columns = header.decode().strip().split(",")
+        
+        ranges = []
+        start = f.tell()
+        while start < size:
+            # Jump ahead, then move forward to the end of that line
+            f.seek(min(start + range_bytes, size))
+            if f.tell() < size:
+                f.readline()
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return columns, ranges
+
+def aggregate_range(path, start, end, header, columns=SALES_COLUMNS, engine="c", group_by=()):
+    """Parse one byte range and return its SalesSummary.
+    
+    Module-level so it can be sent to a ProcessPoolExecutor.
+    
+    Args:
+        path: CSV file path
+        start, end: Byte offsets from split_byte_ranges
+        header: Column names of the file
+        columns: Mapping of column name to dtype to parse
+        engine: CSV parser, "c" or "pyarrow"
+        group_by: Groupings to summarize, see utils.grouped.GROUP_KEYS
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    frame = parse_csv_bytes(data, header, columns, engine)
+    return SalesSummary.from_frame(frame, group_by)
@@ -0,0 +1,162 @@
+"""Columnar sidecar cache of a parsed CSV file, read back with np.memmap.
+
+The first run over a CSV file parses it as usual and, as chunks stream past,
+appends every column to a raw binary file: numbers as float64, dates as
+datetime64[s] and strings dictionary-encoded as int32 codes. A meta.json
+records the row count, the column types, the string categories and the
+source file's size and mtime. Later runs memory-map the columns and slice
+chunks straight out of them, with no text parsing at all. A source file with
+a different size or mtime is treated as a miss, and the sidecar is rebuilt.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+from utils.aggregate import next_chunk_size, read_chunks
+
+# How each column of the sales CSV is stored
+SALES_SCHEMA = {"date": "datetime64[s]", "amount": "float64", "product": "category"}
+
+class ColumnarSidecar:
+    """Directory of memory-mappable column files, one entry per source CSV."""
+
+    def __init__(self, cache_dir=".csv_cache", schema=SALES_SCHEMA):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding one sub-directory per source file
+            schema: Mapping of column name to stored type: a NumPy dtype,
+                "datetime64[s]" or "category" (dictionary-encoded strings)
+        """
+        self.cache_dir = cache_dir
+        self.schema = schema
+
+    def _entry_dir(self, path):
+        """Return the entry directory for a source file."""
+        key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()
+        return os.path.join(self.cache_dir, key)
+
+    def _load_meta(self, path):
+        """Return the entry's metadata if it matches the source file, else None."""
+        stat = os.stat(path)
+        try:
+            with open(os.path.join(self._entry_dir(path), "meta.json")) as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if meta["size"] != stat.st_size or meta["mtime_ns"] != stat.st_mtime_ns:
+            return None
+        if meta["schema"] != self.schema:
+            return None
+        return meta
+
+    def read_chunks(self, path, chunk_size, columns, engine="c", skip_rows=0):
+        """Yield DataFrames of at most chunk_size rows with the given columns.
+
+        Served from the memory-mapped sidecar when it is current, otherwise
+        parsed from the CSV while the sidecar is built.
+
+        Args:
+            path: CSV file path
+            chunk_size: Rows per chunk, or a callable as for read_chunks
+            columns: Names of the columns to return (must be in the schema)
+            engine: CSV parser used when building, "c" or "pyarrow"
+            skip_rows: Number of rows to skip before the first chunk
+        """
+        meta = self._load_meta(path)
+        if meta is not None:
+            yield from self._read(self._entry_dir(path), meta, chunk_size, columns, skip_rows)
+        elif skip_rows:
+            # A partial pass cannot build the sidecar, so just parse (and convert)
+            text_columns = {name: "float64" if kind == "float64" else "str" for name, kind in self.schema.items()}
+            for chunk in read_chunks(path, chunk_size, text_columns, engine, skip_rows):
+                yield self._convert(chunk)[list(columns)]
+        else:
+            yield from self._build(path, chunk_size, columns, engine)
+
+    def _read(self, entry, meta, chunk_size, columns, skip_rows=0):
+        """Slice chunks out of the memory-mapped column files."""
+        rows = meta["rows"]
+        arrays = {}
+        for name in columns:
+            info = meta["columns"][name]
+            arrays[name] = (
+                np.memmap(os.path.join(entry, f"{name}.bin"), dtype=info["dtype"], mode="r", shape=(rows,))
+                if rows else np.empty(0, dtype=info["dtype"])
+            )
+
+        start, size = skip_rows, next_chunk_size(chunk_size, 0)
+        while start < rows:
+            chunk = {}
+            for name, array in arrays.items():
+                values = array[start:start + size]
+                categories = meta["columns"][name].get("categories")
+                chunk[name] = pd.Categorical.from_codes(values, categories) if categories is not None else values
+            chunk = pd.DataFrame(chunk)
+            yield chunk
+            start, size = start + len(chunk), next_chunk_size(chunk_size, len(chunk))
+
+    def _build(self, path, chunk_size, columns, engine):
+        """Parse the CSV, yielding typed chunks and writing the column files."""
+        stat = os.stat(path)
+        entry = self._entry_dir(path)
+        tmp = f"{entry}.{os.getpid()}.tmp"
+        os.makedirs(tmp, exist_ok=True)
+
+        # Parse strings as text and convert them below
+        text_columns = {name: "float64" if kind == "float64" else "str" for name, kind in self.schema.items()}
+        categories = {name: {} for name, kind in self.schema.items() if kind == "category"}
+        files = {name: open(os.path.join(tmp, f"{name}.bin"), "wb") for name in self.schema}
+        rows = 0
+        try:
+            for chunk in read_chunks(path, chunk_size, text_columns, engine):
+                chunk = self._convert(chunk)
+                for name, kind in self.schema.items():
+                    if kind == "category":
+                        self._encode(chunk[name], categories[name]).tofile(files[name])
+                    else:
+                        chunk[name].to_numpy().astype(kind).tofile(files[name])
+                rows += len(chunk)
+                yield chunk[list(columns)]
+        except BaseException:
+            for f in files.values():
+                f.close()
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        for f in files.values():
+            f.close()
+        meta = {
+            "source": os.path.abspath(path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "schema": self.schema,
+            "rows": rows,
+            "columns": {
+                name: {"dtype": "int32", "categories": list(categories[name])} if kind == "category"
+                else {"dtype": kind}
+                for name, kind in self.schema.items()
+            }
+        }
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+
+    def _convert(self, chunk):
+        """Give a parsed chunk the same column types a sidecar read would."""
+        for name, kind in self.schema.items():
+            if kind.startswith("datetime64"):
+                chunk[name] = pd.to_datetime(chunk[name], format="ISO8601").astype(kind)
+        return chunk
+
+    @staticmethod
+    def _encode(values, categories):
+        """Map strings to int32 codes, adding new strings to categories."""
+        codes, uniques = pd.factorize(values)
+        lookup = np.array([categories.setdefault(u, len(categories)) for u in uniques] + [-1], dtype=np.int32)
+        # factorize marks missing values with -1, which picks the trailing -1
+        return lookup[codes]
@@ -0,0 +1,97 @@
+"""Mergeable KLL quantile sketch.
+
+A KLL sketch keeps a stack of levels. An item at level h stands for 2**h
+original values. When a level grows past its capacity, it is sorted and
+every other item (starting at a random offset 0 or 1) is promoted to the
+next level, halving its size while keeping ranks unbiased. Capacities shrink
+geometrically towards the bottom levels, so the sketch holds O(k) items
+regardless of how many values it has seen, and the rank error is roughly
+1.7 / k. The coin flips come from one module-level generator, not one per
+sketch, so sketches stay cheap to create and to pickle.
+
+Two sketches merge by concatenating their levels and compacting again, so
+partial sketches from chunks or worker processes combine in any order
+without revisiting the data.
+"""
+
+import math
+import numpy as np
+
+# Shared by every sketch; creating a generator per sketch dominated chunk time
+_COIN = np.random.default_rng(0)
+
+class QuantileSketch:
+    """KLL sketch of a stream of floats, updated with NumPy arrays."""
+
+    def __init__(self, k=200):
+        """Initialize an empty sketch.
+
+        Args:
+            k: Capacity of the top level; larger k is more accurate
+        """
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+
+    def update(self, values):
+        """Add a 1-D array of values."""
+        if len(values) == 0:
+            return
+        self.levels[0] = np.concatenate([self.levels[0], np.asarray(values, dtype=np.float64)])
+        self.count += len(values)
+        self._compress()
+
+    def merge(self, other):
+        """Return a sketch summarizing both inputs."""
+        merged = QuantileSketch(self.k)
+        merged.count = self.count + other.count
+        depth = max(len(self.levels), len(other.levels))
+        merged.levels = [
+            np.concatenate([
+                self.levels[h] if h < len(self.levels) else np.empty(0),
+                other.levels[h] if h < len(other.levels) else np.empty(0)
+            ])
+            for h in range(depth)
+        ]
+        merged._compress()
+        return merged
+
+    def _capacity(self, level):
+        """Capacity of a level: k at the top, shrinking by 2/3 per level down."""
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _compress(self):
+        """Compact levels until every level is within its capacity."""
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(items)
+            # An odd item out stays behind at this level
+            keep = len(items) % 2
+            promoted = items[keep + _COIN.integers(2)::2]
+            self.levels[level] = items[:keep]
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            # Adding a level shrinks the capacities below it, so start over
+            level = 0
+
+    def quantiles(self, qs):
+        """Estimate the values at the given quantiles (each in [0, 1])."""
+        if self.count == 0:
+            return [float("nan")] * len(qs)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** h) for h, items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        ranks = np.asarray(qs) * cumulative[-1]
+        indexes = np.minimum(np.searchsorted(cumulative, ranks), len(items) - 1)
+        return [float(v) for v in items[indexes]]
+
+    def quantile(self, q):
+        """Estimate the value at quantile q."""
+        return self.quantiles([q])[0]
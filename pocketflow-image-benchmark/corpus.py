@@ -0,0 +1,48 @@
+"""Synthetic JPEG corpora of configurable size and resolution."""
+
+import os
+import json
+import numpy as np
+from PIL import Image
+
+def generate_corpus(corpus_dir, count, width, height, quality=90, seed=0):
+    """Write count distinct width x height JPEGs to corpus_dir.
+
+    Images are smooth colour gradients plus noise, which compress and decode
+    like photographs rather than flat test patterns. A corpus.json spec file
+    is written alongside; if it already matches, the existing corpus is
+    reused.
+
+    Returns:
+        list: Sorted image file names
+    """
+    spec = {"count": count, "width": width, "height": height, "quality": quality, "seed": seed}
+    spec_path = os.path.join(corpus_dir, "corpus.json")
+    names = [f"img_{i:06d}.jpg" for i in range(count)]
+
+    try:
+        with open(spec_path) as f:
+            if json.load(f) == spec:
+                return names
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+
+    # Remove images from a previous, different corpus
+    os.makedirs(corpus_dir, exist_ok=True)
+    for old in os.listdir(corpus_dir):
+        if old.startswith("img_") and old.endswith(".jpg"):
+            os.remove(os.path.join(corpus_dir, old))
+
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    base = np.stack([x * 255 // width, y * 255 // height, (x + y) * 255 // (width + height)], axis=-1)
+
+    for name in names:
+        # Shift the gradient and add fresh noise so every image is distinct
+        shifted = np.roll(base, (rng.integers(height), rng.integers(width)), axis=(0, 1))
+        pixels = np.clip(shifted + rng.integers(-20, 20, base.shape), 0, 255).astype(np.uint8)
+        Image.fromarray(pixels).save(os.path.join(corpus_dir, name), "JPEG", quality=quality)
+
+    with open(spec_path, "w") as f:
+        json.dump(spec, f)
+    return names
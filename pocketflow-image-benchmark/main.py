@@ -0,0 +1,117 @@
+"""Benchmark the image pipeline examples on a synthetic corpus.
+
+Runs pocketflow-batch-flow and pocketflow-parallel-batch-flow (with their
+simulated delays off) at several concurrency levels. It reports per-stage
+latency percentiles and end-to-end images per second, and writes everything
+to a JSON file that a later run can be compared against.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import numpy as np
+from corpus import generate_corpus
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# create_flow() options for each example at concurrency n
+EXAMPLES = {
+    "batch-flow": lambda n: {
+        "fan_out": True, "executor": None if n == 1 else "thread", "max_workers": n
+    },
+    "parallel-batch-flow": lambda n: {
+        "fan_out": True, "max_concurrency": n, "max_workers": n,
+        "load_executor": "thread", "filter_executor": "process", "engine": "numpy"
+    },
+}
+
+def percentiles(samples):
+    """Summarize stage latencies in milliseconds."""
+    if not samples:
+        return None
+    ms = np.array(samples) * 1e3
+    return {
+        "count": len(ms),
+        "p50": float(np.percentile(ms, 50)),
+        "p90": float(np.percentile(ms, 90)),
+        "p99": float(np.percentile(ms, 99)),
+        "mean": float(ms.mean()),
+    }
+
+def run_example(example, corpus_dir, options):
+    """Run one configuration in a fresh interpreter and summarize it."""
+    example_dir = os.path.join(ROOT, f"pocketflow-{example}")
+    proc = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "pocketflow-image-benchmark", "runner.py"),
+         example_dir, corpus_dir, json.dumps(options)],
+        capture_output=True, text=True, check=True
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {
+        "images": result["images"],
+        "seconds": result["seconds"],
+        "images_per_sec": result["images"] / result["seconds"],
+        "stages": {name: percentiles(samples) for name, samples in result["stages"].items()},
+    }
+
+def print_run(run, baseline=None):
+    """Print one run's throughput and stage percentiles."""
+    line = f"{run['example']:<20}{run['concurrency']:>5}{run['images_per_sec']:>10.1f} img/s"
+    if baseline:
+        change = run["images_per_sec"] / baseline["images_per_sec"] - 1
+        line += f"  ({change:+.1%} vs baseline)"
+    print(line)
+    for name, stats in run["stages"].items():
+        if stats:
+            print(f"    {name:<12} p50 {stats['p50']:8.1f} ms  p90 {stats['p90']:8.1f} ms  p99 {stats['p99']:8.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=24, help="images in the corpus")
+    parser.add_argument("--size", default="1920x1080", help="image WIDTHxHEIGHT")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8], help="concurrency levels")
+    parser.add_argument("--examples", nargs="+", default=list(EXAMPLES), choices=list(EXAMPLES))
+    parser.add_argument("--corpus-dir", default="corpus")
+    parser.add_argument("--output", default="results.json")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.split("x"))
+    print(f"Generating corpus: {args.count} images at {width}x{height}...")
+    generate_corpus(args.corpus_dir, args.count, width, height)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {(r["example"], r["concurrency"]): r for r in json.load(f)["runs"]}
+
+    runs = []
+    print(f"\n{'example':<20}{'conc':>5}{'throughput':>16}")
+    for example in args.examples:
+        for level in args.levels:
+            options = EXAMPLES[example](level)
+            run = {"example": example, "concurrency": level, "options": options}
+            run.update(run_example(example, os.path.abspath(args.corpus_dir), options))
+            runs.append(run)
+            print_run(run, baseline.get((example, level)))
+
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "corpus": {"count": args.count, "width": width, "height": height},
+        },
+        "runs": runs,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    main()
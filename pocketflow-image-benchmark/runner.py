@@ -0,0 +1,81 @@
+"""Run one example's image flow over a corpus and print its timings as JSON.
+
+Each run happens in a fresh interpreter (started by main.py), because every
+example has its own top-level flow/nodes/utils modules. Stage latencies are
+measured by wrapping each node class's run method, so the examples
+themselves need no instrumentation.
+
+Usage:
+    python runner.py EXAMPLE_DIR CORPUS_DIR '{"fan_out": true, ...}'
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import tempfile
+import functools
+
+def time_stage(cls, method_name, samples):
+    """Patch cls.method_name to append its wall time to samples."""
+    original = getattr(cls, method_name)
+
+    if asyncio.iscoroutinefunction(original):
+        @functools.wraps(original)
+        async def timed(self, shared):
+            start = time.perf_counter()
+            try:
+                return await original(self, shared)
+            finally:
+                samples.append(time.perf_counter() - start)
+    else:
+        @functools.wraps(original)
+        def timed(self, shared):
+            start = time.perf_counter()
+            try:
+                return original(self, shared)
+            finally:
+                samples.append(time.perf_counter() - start)
+
+    setattr(cls, method_name, timed)
+
+def main():
+    example_dir, corpus_dir, options = sys.argv[1], os.path.abspath(sys.argv[2]), json.loads(sys.argv[3])
+
+    # Import the example's modules, writing outputs to a scratch directory
+    sys.path.insert(0, os.path.abspath(example_dir))
+    os.chdir(tempfile.mkdtemp(prefix="image-benchmark-"))
+    import flow
+    import nodes
+    from pocketflow import AsyncNode
+    from utils.executor import shutdown_executors
+
+    # Turn off the demo's simulated sleeps (the sync example has none)
+    if hasattr(nodes, "SIMULATE_DELAYS"):
+        nodes.SIMULATE_DELAYS = False
+
+    stages = {name: [] for name in ("LoadImage", "ApplyFilter", "SaveImage")}
+    for name, samples in stages.items():
+        cls = getattr(nodes, name)
+        time_stage(cls, "_run_async" if issubclass(cls, AsyncNode) else "_run", samples)
+
+    images = sorted(f for f in os.listdir(corpus_dir) if f.endswith(".jpg"))
+    batch_flow = flow.create_flow(**options)
+
+    start = time.perf_counter()
+    try:
+        if isinstance(batch_flow, AsyncNode):
+            shared = {"images": [os.path.join(corpus_dir, f) for f in images]}
+            asyncio.run(batch_flow.run_async(shared))
+        else:
+            batch_flow.run({"images_dir": corpus_dir})
+        elapsed = time.perf_counter() - start
+    finally:
+        shutdown_executors()
+
+    # Timings go on the last line; the flows print progress before it
+    print(json.dumps({"images": len(images), "seconds": elapsed, "stages": stages}))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Students per second through create_flow(), with and without FlowPlans.
+
+Generates schools of the requested sizes (cached in benchmarks/data, one
+grade file per student spread over --classes classes), then runs the flow
+once per size x mode. Each run happens in a fresh interpreter inside the
+school's directory, with per-student output discarded.
+
+Modes:
+    flow       per-student flows run by Flow._orch (a node copy per step)
+    compiled   per-student flows run by FlowPlans (create_flow(compiled=True))
+    bulk       one LoadClassGrades node per class, for reference
+
+Usage (from the example directory):
+    python -m benchmarks.items_per_second [--students 100000 1000000]
+        [--modes flow compiled bulk] [--classes 10] [--json out.json]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import contextlib
+import numpy as np
+
+EXAMPLE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(EXAMPLE_DIR, "benchmarks", "data")
+MODES = ["flow", "compiled", "bulk"]
+
+def run_one(config):
+    """Run the flow once as described by config and return its measurements."""
+    from flow import create_flow
+
+    flow = create_flow(compiled=config["mode"] == "compiled", bulk=config["mode"] == "bulk")
+    shared = {}
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        flow.run(shared)
+    wall = time.perf_counter() - start
+    return {
+        **config,
+        "wall_s": wall,
+        "items_per_s": len(shared["results"]) / wall,
+        "us_per_item": wall / len(shared["results"]) * 1e6,
+        "school_average": shared["results"].mean()
+    }
+
+def spawn(config, cwd):
+    """Run one configuration in a fresh interpreter and return its result."""
+    env = {**os.environ, "PYTHONPATH": EXAMPLE_DIR}
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.items_per_second", "--child", json.dumps(config)],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def ensure_data(students, classes, seed=42):
+    """Return a directory holding school/ with the given number of students."""
+    root = os.path.join(DATA_DIR, f"students_{students}_{classes}")
+    done = os.path.join(root, ".complete")
+    if os.path.exists(done):
+        return root
+
+    print(f"Generating {students:,} student files...", flush=True)
+    rng = np.random.default_rng(seed)
+    for k, count in enumerate(np.diff(np.linspace(0, students, classes + 1).astype(int))):
+        class_path = os.path.join(root, "school", f"class_{k}")
+        os.makedirs(class_path, exist_ok=True)
+        # 3-5 grades per student, written as text in one pass per class
+        grades = rng.integers(50, 101, size=(count, 5)) / 10
+        lengths = rng.integers(3, 6, size=count)
+        for i in range(count):
+            with open(os.path.join(class_path, f"student{i}.txt"), "w") as f:
+                f.write("".join(f"{grade}\n" for grade in grades[i, :lengths[i]]))
+    open(done, "w").close()
+    return root
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--json", help="Also write all results to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_one(json.loads(args.child))))
+        return
+
+    print(f"{'students':>10} {'mode':<9}{'wall s':>9}{'items/s':>11}{'us/item':>9}{'speedup':>9}")
+    results = []
+    for students in args.students:
+        root = ensure_data(students, args.classes)
+        baseline = None
+        for mode in args.modes:
+            result = spawn({"students": students, "classes": args.classes, "mode": mode}, root)
+            results.append(result)
+            baseline = baseline or result["wall_s"]
+            print(f"{students:>10,} {mode:<9}{result['wall_s']:>9.2f}{result['items_per_s']:>11,.0f}"
+                  f"{result['us_per_item']:>9.1f}{baseline / result['wall_s']:>8.2f}x", flush=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+
+if __name__ == "__main__":
+    main()
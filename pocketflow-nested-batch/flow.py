@@ -1,6 +1,12 @@
 import os
-from pocketflow import Flow, BatchFlow
-from nodes import LoadGrades, CalculateAverage
+import copy
+import warnings
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pocketflow import BaseNode, Flow, BatchFlow
+from nodes import LoadGrades, CalculateAverage, LoadClassGrades
+from utils.grades import scan_students
+from utils.results import ResultsStore
 
 def create_base_flow():
     """Create base flow for processing one student's grades."""
@@ -14,9 +20,110 @@ def create_base_flow():
     # Create and return flow
     return Flow(start=load)
 
-class ClassBatchFlow(BatchFlow):
+def _is_plain_flow(node):
+    """True for a Flow that only orchestrates (no custom prep, post or _run)."""
+    kind = type(node)
+    return (isinstance(node, Flow) and kind._run is Flow._run
+            and kind.prep is BaseNode.prep and kind.post is Flow.post)
+
+class FlowPlan:
+    """Execution plan for a static flow graph, compiled once and run per item.
+    
+    Flow._orch copies each node before running it and looks its successor
+    up step by step, and a nested Flow copies its params again. That costs
+    more than the work of a tiny node. A plan does it once:
+    
+    - The graph is walked into a list of steps, each with an action -> next
+      step table. A plain nested Flow becomes a sub-plan run inline.
+    - Nodes are copied once per thread, not once per step. Each thread
+      reuses its own instances, so concurrent items never share a node.
+    - One item's steps share its params dict, as they do in Flow._orch.
+    
+    The graph must not change after the plan is built. Nodes must not carry
+    instance state from one run to the next, which holds for nodes that set
+    what they need in prep.
+    """
+    
+    def __init__(self, start):
+        self.nodes, self.subplans, self.successors = [], [], []
+        self.local = threading.local()
+        if start is not None:
+            self._visit(start, {})
+    
+    def _visit(self, node, index):
+        """Add node and everything reachable from it; return its step."""
+        if id(node) in index:
+            return index[id(node)]
+        step = index[id(node)] = len(self.nodes)
+        self.nodes.append(node)
+        self.subplans.append(FlowPlan(node.start_node) if _is_plain_flow(node) else None)
+        self.successors.append({})
+        for action, successor in node.successors.items():
+            self.successors[step][action] = self._visit(successor, index)
+        return step
+    
+    def run(self, shared, params):
+        """Run the graph once with params, like Flow._orch; return the last action."""
+        nodes = getattr(self.local, "nodes", None)
+        if nodes is None:
+            nodes = self.local.nodes = [copy.copy(node) for node in self.nodes]
+        
+        step, last_action = (0 if nodes else None), None
+        while step is not None:
+            subplan, successors = self.subplans[step], self.successors[step]
+            if subplan is not None:
+                last_action = subplan.run(shared, params)
+            else:
+                node = nodes[step]
+                node.params = params
+                last_action = node._run(shared)
+            step = successors.get(last_action or "default")
+            if step is None and successors:
+                warnings.warn(f"Flow ends: '{last_action}' not found in {list(successors)}")
+        return last_action
+
+class ParallelBatchFlow(BatchFlow):
+    """BatchFlow that runs its children concurrently on a thread pool.
+    
+    Each run gets its own pool of max_workers threads, so nesting one
+    ParallelBatchFlow in another gives a separate limit per level: with 4
+    class workers and 16 student workers, up to 4 classes run at once, each
+    with up to 16 students. post still runs only after every child of this
+    flow has finished. With max_workers=1 children run one after another in
+    the calling thread, exactly like BatchFlow.
+    
+    With compiled=True each child runs through a FlowPlan of the start
+    graph, built here, instead of Flow._orch.
+    """
+    
+    def __init__(self, start=None, max_workers=1, compiled=False):
+        super().__init__(start=start)
+        self.max_workers = max_workers
+        self.plan = FlowPlan(start) if compiled else None
+    
+    def _run(self, shared):
+        prep_res = self.prep(shared) or []
+        run_child = self.plan.run if self.plan is not None else self._orch
+        if self.max_workers <= 1:
+            for batch_params in prep_res:
+                run_child(shared, {**self.params, **batch_params})
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                # list() waits for every child and re-raises the first failure
+                list(pool.map(lambda bp: run_child(shared, {**self.params, **bp}), prep_res))
+        return self.post(shared, prep_res, None)
+
+class ClassBatchFlow(ParallelBatchFlow):
     """BatchFlow for processing all students in a class."""
     
+    def __init__(self, start=None, max_workers=1, cache=None, compiled=False):
+        """Initialize with the student flow, the student concurrency, an
+        optional GradeCache that limits each run to changed files and
+        whether to run students through a FlowPlan."""
+        super().__init__(start=start, max_workers=max_workers, compiled=compiled)
+        self.cache = cache
+        self.removed = []
+    
     def prep(self, shared):
         """Generate parameters for each student in the class."""
         # Get class folder from parameters
@@ -24,7 +131,14 @@ class ClassBatchFlow(BatchFlow):
         
         # List all student files
         class_path = os.path.join("school", class_folder)
-        students = [f for f in os.listdir(class_path) if f.endswith(".txt")]
+        if self.cache is not None:
+            # Only new or changed files need their flow run
+            changed, self.removed = self.cache.diff(class_folder, scan_students(class_path))
+            return [
+                {"student": student, "mtime_ns": mtime_ns, "size": size}
+                for student, _, mtime_ns, size in changed
+            ]
+        students = sorted(f for f in os.listdir(class_path) if f.endswith(".txt"))
         
         # Return parameters for each student
         return [{"student": student} for student in students]
@@ -32,42 +146,75 @@ class ClassBatchFlow(BatchFlow):
     def post(self, shared, prep_res, exec_res):
         """Calculate and print class average."""
         class_name = self.params["class"]
-        class_results = shared["results"][class_name]
-        class_average = sum(class_results.values()) / len(class_results)
+        if self.cache is not None:
+            # Fold the rerun students into the running class totals
+            class_results = shared["results"].class_results(class_name)
+            self.cache.update(class_name, {
+                p["student"]: (p["mtime_ns"], p["size"], class_results[p["student"]]) for p in prep_res
+            }, self.removed)
+            class_average = self.cache.class_average(class_name)
+        else:
+            class_average = shared["results"].class_mean(class_name)
         
         print(f"Class {class_name.split('_')[1].upper()} Average: {class_average:.2f}\n")
         return "default"
 
-class SchoolBatchFlow(BatchFlow):
+class SchoolBatchFlow(ParallelBatchFlow):
     """BatchFlow for processing all classes in the school."""
     
+    def __init__(self, start=None, max_workers=1, cache=None, compiled=False):
+        """Initialize with the class flow, the class concurrency, an
+        optional GradeCache holding running totals and whether to run
+        classes through a FlowPlan."""
+        super().__init__(start=start, max_workers=max_workers, compiled=compiled)
+        self.cache = cache
+    
     def prep(self, shared):
-        """Generate parameters for each class."""
+        """Create the results store and generate parameters for each class."""
+        shared.setdefault("results", ResultsStore())
+        
         # List all class folders
-        classes = [d for d in os.listdir("school") if os.path.isdir(os.path.join("school", d))]
+        classes = sorted(d for d in os.listdir("school") if os.path.isdir(os.path.join("school", d)))
         
         # Return parameters for each class
         return [{"class": class_name} for class_name in classes]
     
     def post(self, shared, prep_res, exec_res):
         """Calculate and print school average."""
-        all_grades = []
-        for class_results in shared["results"].values():
-            all_grades.extend(class_results.values())
-            
-        school_average = sum(all_grades) / len(all_grades)
+        if self.cache is not None:
+            # From the class totals, without touching any student
+            self.cache.prune([p["class"] for p in prep_res])
+            school_average = self.cache.school_average()
+        else:
+            school_average = shared["results"].mean()
         print(f"School Average: {school_average:.2f}")
         return "default"
 
-def create_flow():
-    """Create the complete nested batch processing flow."""
+def create_flow(class_workers=1, student_workers=1, bulk=False, cache=None, compiled=False):
+    """Create the complete nested batch processing flow.
+    
+    Args:
+        class_workers: Classes processed concurrently
+        student_workers: Students processed concurrently within each class
+        bulk: Load and average each class with one LoadClassGrades node
+            instead of a flow per student (no per-student output)
+        cache: Optional GradeCache; only new or changed student files are
+            processed and averages come from running totals
+        compiled: Run classes and students through precompiled FlowPlans
+            that reuse node instances, instead of copying nodes per step
+    """
+    if bulk:
+        return SchoolBatchFlow(
+            start=LoadClassGrades(cache=cache), max_workers=class_workers, cache=cache, compiled=compiled
+        )
+    
     # Create base flow for single student
     base_flow = create_base_flow()
     
     # Wrap in ClassBatchFlow for processing all students in a class
-    class_flow = ClassBatchFlow(start=base_flow)
+    class_flow = ClassBatchFlow(start=base_flow, max_workers=student_workers, cache=cache, compiled=compiled)
     
     # Wrap in SchoolBatchFlow for processing all classes
-    school_flow = SchoolBatchFlow(start=class_flow)
+    school_flow = SchoolBatchFlow(start=class_flow, max_workers=class_workers, cache=cache, compiled=compiled)
     
     return school_flow 
\ No newline at end of file
@@ -1,8 +1,13 @@
 import os
 from flow import create_flow
+from utils.grade_cache import GradeCache
 
 def create_sample_data():
-    """Create sample grade files."""
+    """Create sample grade files that do not exist yet.
+
+    Existing files are left alone, so their mtimes stay put and the grade
+    cache can serve them on later runs.
+    """
     # Create directory structure
     os.makedirs("school/class_a", exist_ok=True)
     os.makedirs("school/class_b", exist_ok=True)
@@ -23,6 +28,8 @@ def create_sample_data():
     for class_name, students in data.items():
         for student, grades in students.items():
             file_path = os.path.join("school", class_name, student)
+            if os.path.exists(file_path):
+                continue
             with open(file_path, 'w') as f:
                 for grade in grades:
                     f.write(f"{grade}\n")
@@ -34,8 +41,9 @@ def main():
     
     print("Processing school grades...\n")
     
-    # Create and run flow
-    flow = create_flow()
+    # Create and run flow sequentially (see the README for class_workers and
+    # student_workers). The cache limits later runs to student files that changed.
+    flow = create_flow(cache=GradeCache())
     flow.run({})
 
 if __name__ == "__main__":
@@ -1,5 +1,7 @@
 import os
 from pocketflow import Node
+from utils.grades import scan_students, load_grades, segment_means
+from utils.results import ResultsStore
 
 class LoadGrades(Node):
     """Node that loads grades from a student's file."""
@@ -18,16 +20,20 @@ class LoadGrades(Node):
         return grades
     
     def post(self, shared, prep_res, grades):
-        """Store grades in shared store."""
-        shared["grades"] = grades
+        """Store grades in shared store, keyed by student.
+        
+        Students may run concurrently, so each one gets its own slot
+        rather than a single shared["grades"] that others could overwrite.
+        """
+        shared.setdefault("grades", {})[(self.params["class"], self.params["student"])] = grades
         return "calculate"
 
 class CalculateAverage(Node):
     """Node that calculates average grade."""
     
     def prep(self, shared):
-        """Get grades from shared store."""
-        return shared["grades"]
+        """Take this student's grades from shared store."""
+        return shared["grades"].pop((self.params["class"], self.params["student"]))
     
     def exec(self, grades):
         """Calculate average."""
@@ -35,18 +41,65 @@ class CalculateAverage(Node):
     
     def post(self, shared, prep_res, average):
         """Store and print result."""
-        # Store in results dictionary
-        if "results" not in shared:
-            shared["results"] = {}
-        
+        # Append to the results store (setdefault is atomic and the store
+        # locks its appends, so concurrent students are safe)
         class_name = self.params["class"]
         student = self.params["student"]
         
-        if class_name not in shared["results"]:
-            shared["results"][class_name] = {}
-            
-        shared["results"][class_name][student] = average
+        shared.setdefault("results", ResultsStore()).append(class_name, student, average)
         
         # Print individual result
         print(f"- {student}: Average = {average:.1f}")
-        return "default" 
\ No newline at end of file
+        return "default"
+
+class LoadClassGrades(Node):
+    """Node that loads and averages every student of a class in one go.
+    
+    Replaces the per-student LoadGrades -> CalculateAverage flow for large
+    classes: one directory scan, batched file reads into a flat array and
+    one vectorized reduction for all averages. With a GradeCache, only new
+    or changed files are read.
+    """
+    
+    def __init__(self, cache=None):
+        super().__init__()
+        self.cache = cache
+    
+    def prep(self, shared):
+        """Get the class directory from parameters."""
+        return os.path.join("school", self.params["class"])
+    
+    def exec(self, class_path):
+        """Scan the class and load and average the students that need it.
+        
+        Returns:
+            tuple: (list of (name, path, mtime_ns, size) that were loaded,
+                    their averages, cached students whose files are gone)
+        """
+        entries = scan_students(class_path)
+        if self.cache is not None:
+            students, removed = self.cache.diff(self.params["class"], entries)
+        else:
+            students, removed = [(entry.name, entry.path, None, None) for entry in entries], []
+        values, counts = load_grades([path for _, path, _, _ in students])
+        return students, segment_means(values, counts), removed
+    
+    def post(self, shared, prep_res, exec_res):
+        """Store the loaded students' averages and print the class average."""
+        students, averages, removed = exec_res
+        class_name = self.params["class"]
+        shared.setdefault("results", ResultsStore()).extend(
+            class_name, [name for name, _, _, _ in students], averages
+        )
+        
+        if self.cache is not None:
+            self.cache.update(class_name, {
+                name: (mtime_ns, size, average)
+                for (name, _, mtime_ns, size), average in zip(students, averages.tolist())
+            }, removed)
+            class_average = self.cache.class_average(class_name)
+        else:
+            class_average = averages.mean()
+        
+        print(f"Class {class_name.split('_')[1].upper()} Average: {class_average:.2f}\n")
+        return "default"
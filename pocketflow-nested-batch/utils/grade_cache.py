@@ -0,0 +1,124 @@
+"""Persistent per-student results with running class and school totals.
+
+Each student's average is stored in SQLite with the mtime and size of the
+file it came from. On the next run only files whose stat changed, new files
+and deleted files are handled. Every class keeps a running sum and count of
+its student averages, adjusted by the difference each change makes, so class
+and school averages cost O(changed students) to maintain. Reading them back
+costs O(classes).
+"""
+
+import sqlite3
+import threading
+
+# SQLite's default limit on parameters in one statement
+_MAX_PARAMS = 999
+
+class GradeCache:
+    """SQLite cache of student averages, safe to share between threads."""
+
+    def __init__(self, path=".grade_cache.sqlite"):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS students (
+                    class TEXT NOT NULL,
+                    student TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    average REAL NOT NULL,
+                    PRIMARY KEY (class, student)
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS classes (
+                    class TEXT PRIMARY KEY,
+                    total REAL NOT NULL,
+                    count INTEGER NOT NULL
+                )
+            """)
+
+    def diff(self, class_name, entries):
+        """Compare a class directory scan with the cache.
+
+        Args:
+            class_name: Class directory name
+            entries: os.DirEntry objects for the class's student files
+
+        Returns:
+            tuple: (list of (name, path, mtime_ns, size) for new or changed
+                    files, list of cached student names with no file)
+        """
+        with self.lock:
+            cached = {
+                student: (mtime_ns, size) for student, mtime_ns, size in self.conn.execute(
+                    "SELECT student, mtime_ns, size FROM students WHERE class = ?", (class_name,)
+                )
+            }
+        changed = []
+        for entry in entries:
+            stat = entry.stat()
+            if cached.pop(entry.name, None) != (stat.st_mtime_ns, stat.st_size):
+                changed.append((entry.name, entry.path, stat.st_mtime_ns, stat.st_size))
+        # Whatever was not popped no longer has a file
+        return changed, list(cached)
+
+    def update(self, class_name, results, removed=()):
+        """Store new averages, drop removed students and adjust the class totals.
+
+        Args:
+            class_name: Class directory name
+            results: Mapping of student name to (mtime_ns, size, average)
+            removed: Names of students whose files are gone
+        """
+        names = list(results) + list(removed)
+        with self.lock, self.conn:
+            old = {}
+            for start in range(0, len(names), _MAX_PARAMS - 1):
+                batch = names[start:start + _MAX_PARAMS - 1]
+                old.update(self.conn.execute(
+                    f"SELECT student, average FROM students WHERE class = ? "
+                    f"AND student IN ({','.join('?' * len(batch))})",
+                    (class_name, *batch)
+                ))
+
+            total = sum(average for _, _, average in results.values()) - sum(old.values())
+            count = sum(name not in old for name in results) - sum(name in old for name in removed)
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO students VALUES (?, ?, ?, ?, ?)",
+                [(class_name, name, *result) for name, result in results.items()]
+            )
+            self.conn.executemany(
+                "DELETE FROM students WHERE class = ? AND student = ?",
+                [(class_name, name) for name in removed]
+            )
+            self.conn.execute("INSERT OR IGNORE INTO classes VALUES (?, 0.0, 0)", (class_name,))
+            self.conn.execute(
+                "UPDATE classes SET total = total + ?, count = count + ? WHERE class = ?",
+                (total, count, class_name)
+            )
+
+    def prune(self, class_names):
+        """Forget every class not in class_names (its directory is gone)."""
+        with self.lock, self.conn:
+            cached = [row[0] for row in self.conn.execute("SELECT class FROM classes")]
+            for class_name in set(cached) - set(class_names):
+                self.conn.execute("DELETE FROM students WHERE class = ?", (class_name,))
+                self.conn.execute("DELETE FROM classes WHERE class = ?", (class_name,))
+
+    def class_average(self, class_name):
+        """Average of the class's student averages, from its running totals."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT total, count FROM classes WHERE class = ?", (class_name,)
+            ).fetchone()
+        return row[0] / row[1] if row and row[1] else float("nan")
+
+    def school_average(self):
+        """Average of every student average, from the class totals."""
+        with self.lock:
+            total, count = self.conn.execute("SELECT SUM(total), SUM(count) FROM classes").fetchone()
+        return total / count if count else float("nan")
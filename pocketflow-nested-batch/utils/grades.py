@@ -0,0 +1,58 @@
+"""Bulk loading of student grade files into one flat NumPy array.
+
+Instead of one node run per student file, a class directory is scanned once
+with os.scandir and its files are read in batches. Each batch is parsed with
+a single split and one float conversion into a flat array, with a count of
+grades per student. Averages for the whole class then come from one
+np.add.reduceat segment reduction.
+"""
+
+import os
+import numpy as np
+
+def scan_students(class_path):
+    """Return the class's student files as os.DirEntry objects sorted by name,
+    from one directory scan."""
+    with os.scandir(class_path) as entries:
+        return sorted(
+            (entry for entry in entries if entry.name.endswith(".txt") and entry.is_file()),
+            key=lambda entry: entry.name
+        )
+
+def load_grades(paths, batch_size=4096):
+    """Read grade files (one grade per line) into a flat array.
+    
+    Args:
+        paths: Student file paths
+        batch_size: Files read and parsed together, which bounds the raw
+            bytes held at once
+        
+    Returns:
+        tuple: (float64 array of every grade in file order,
+                int64 array with the number of grades in each file)
+    """
+    values, counts = [], np.empty(len(paths), dtype=np.int64)
+    for start in range(0, len(paths), batch_size):
+        contents = []
+        for i, path in enumerate(paths[start:start + batch_size], start):
+            with open(path, "rb") as f:
+                data = f.read()
+            # One grade per line; the last line may lack its newline
+            counts[i] = data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+            contents.append(data)
+        
+        batch = np.array(b"\n".join(contents).split(), dtype=np.float64)
+        if len(batch) != counts[start:start + batch_size].sum():
+            raise ValueError("Grade files must hold exactly one grade per line")
+        values.append(batch)
+    
+    return (np.concatenate(values) if values else np.empty(0)), counts
+
+def segment_means(values, counts):
+    """Average each file's run of grades in one vectorized reduction."""
+    if np.any(counts == 0):
+        raise ValueError("Every student file needs at least one grade")
+    if len(counts) == 0:
+        return np.empty(0)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    return np.add.reduceat(values, starts) / counts
@@ -0,0 +1,132 @@
+"""Compact, append-only store of per-student results.
+
+Instead of nested dicts of floats (class -> student -> average), results are
+kept in three parallel NumPy columns: an int32 class id, an int32 student id
+and a float64 value. Class and student names are interned, so each distinct
+name is stored once however many rows refer to it. The columns grow by
+doubling, so appends are amortized O(1). Each class also keeps an int32
+array of its row indexes, grown the same way, so per-class lookups and means
+touch only that class's rows instead of masking every row once per class.
+Rollups are NumPy calls over the columns rather than Python loops.
+
+Appends take a lock, so concurrently running class and student flows can
+share one store.
+"""
+
+import threading
+import numpy as np
+
+class ResultsStore:
+    """Columnar (class, student, value) rows with interned names."""
+
+    def __init__(self, capacity=1024):
+        self.lock = threading.Lock()
+        self.class_names, self._class_ids = [], {}
+        self.student_names, self._student_ids = [], {}
+        self._classes = np.empty(capacity, dtype=np.int32)
+        self._students = np.empty(capacity, dtype=np.int32)
+        self._values = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+        # Per class id: row indexes of its rows and how many are filled
+        self._class_rows, self._class_sizes = [], []
+
+    def __len__(self):
+        return self._size
+
+    @staticmethod
+    def _intern(name, names, ids):
+        """Return name's id, adding it to the table if it is new."""
+        key = ids.get(name)
+        if key is None:
+            key = ids[name] = len(names)
+            names.append(name)
+        return key
+
+    def _reserve(self, extra):
+        """Grow the columns, by doubling, to hold `extra` more rows."""
+        needed = self._size + extra
+        if needed <= len(self._values):
+            return
+        capacity = max(needed, 2 * len(self._values))
+        for name in ("_classes", "_students", "_values"):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+
+    def _add_class_rows(self, class_name, start, end):
+        """Intern class_name and record rows start..end-1 as belonging to it."""
+        class_id = self._intern(class_name, self.class_names, self._class_ids)
+        if class_id == len(self._class_rows):
+            self._class_rows.append(np.empty(16, dtype=np.int32))
+            self._class_sizes.append(0)
+        rows, filled = self._class_rows[class_id], self._class_sizes[class_id]
+        if filled + end - start > len(rows):
+            grown = np.empty(max(filled + end - start, 2 * len(rows)), dtype=np.int32)
+            grown[:filled] = rows[:filled]
+            rows = self._class_rows[class_id] = grown
+        rows[filled:filled + end - start] = np.arange(start, end)
+        self._class_sizes[class_id] = filled + end - start
+        return class_id
+
+    def append(self, class_name, student, value):
+        """Record one student's result."""
+        with self.lock:
+            self._reserve(1)
+            i = self._size
+            self._classes[i] = self._add_class_rows(class_name, i, i + 1)
+            self._students[i] = self._intern(student, self.student_names, self._student_ids)
+            self._values[i] = value
+            self._size += 1
+
+    def extend(self, class_name, students, values):
+        """Record a whole class's results at once.
+
+        Args:
+            class_name: Class every row belongs to
+            students: Student names, in the same order as values
+            values: Sequence or array of results
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if len(students) != len(values):
+            raise ValueError("students and values must have the same length")
+        with self.lock:
+            self._reserve(len(values))
+            start, end = self._size, self._size + len(values)
+            self._classes[start:end] = self._add_class_rows(class_name, start, end)
+            self._students[start:end] = [
+                self._intern(student, self.student_names, self._student_ids) for student in students
+            ]
+            self._values[start:end] = values
+            self._size = end
+
+    def _class_columns(self, class_name):
+        """Consistent (students, values) of one class's rows, or None."""
+        with self.lock:
+            class_id = self._class_ids.get(class_name)
+            if class_id is None:
+                return None
+            rows = self._class_rows[class_id][:self._class_sizes[class_id]]
+            return self._students[rows], self._values[rows]
+
+    def class_results(self, class_name):
+        """Return {student: value} for one class."""
+        columns = self._class_columns(class_name)
+        if columns is None:
+            return {}
+        students, values = columns
+        names = self.student_names
+        return {names[s]: v for s, v in zip(students.tolist(), values.tolist())}
+
+    def class_mean(self, class_name):
+        """Mean value of one class's rows."""
+        columns = self._class_columns(class_name)
+        if columns is None:
+            return float("nan")
+        return columns[1].mean()
+
+    def mean(self):
+        """Mean value over every row."""
+        with self.lock:
+            values = self._values[:self._size]
+        return values.mean() if len(values) else float("nan")
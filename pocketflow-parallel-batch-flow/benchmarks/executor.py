@@ -0,0 +1,60 @@
+"""Throughput of ApplyFilter's exec modes on the images/ fixtures.
+
+Runs every image x filter combination through the same run_blocking call
+ApplyFilter uses (without the simulated sleeps) and reports filtered
+images per second for inline, thread and process execution.
+
+Usage (from the example directory):
+    python -m benchmarks.executor [--repeat 10] [--workers 1 2 4 8]
+"""
+
+import os
+import time
+import asyncio
+import argparse
+from utils.executor import run_blocking, shutdown_executors
+from utils.filters import load_image, apply_filter
+
+FILTERS = ["grayscale", "blur", "sepia"]
+
+def load_fixtures(images_dir="images"):
+    """Decode every fixture image once, up front."""
+    paths = sorted(
+        os.path.join(images_dir, f) for f in os.listdir(images_dir)
+        if f.lower().endswith((".jpg", ".jpeg", ".png"))
+    )
+    return [load_image(path) for path in paths]
+
+async def run_batch(images, executor, max_workers, repeat):
+    """Filter all combinations concurrently and return items per second."""
+    jobs = [(image, f) for _ in range(repeat) for image in images for f in FILTERS]
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_blocking(executor, apply_filter, image, f, max_workers=max_workers)
+        for image, f in jobs
+    ))
+    return len(jobs) / (time.perf_counter() - start)
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    images = load_fixtures()
+    print(f"{len(images)} images x {len(FILTERS)} filters x {args.repeat} repeats, {os.cpu_count()} CPUs\n")
+    print(f"{'mode':<10}{'workers':>8}{'items/s':>12}")
+
+    baseline = await run_batch(images, None, None, args.repeat)
+    print(f"{'inline':<10}{'-':>8}{baseline:>12.1f}")
+
+    for executor in ["thread", "process"]:
+        for workers in args.workers:
+            # Warm the pool so process start-up is not counted
+            await run_blocking(executor, apply_filter, images[0], "grayscale", max_workers=workers)
+            rate = await run_batch(images, executor, workers, args.repeat)
+            print(f"{executor:<10}{workers:>8}{rate:>12.1f}  ({rate / baseline:.2f}x)")
+            shutdown_executors()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""Microbenchmark: fused NumPy kernels vs the per-filter PIL/NumPy paths.
+
+For each filter alone and for all three together, reports the best wall
+time over several runs and the peak NumPy scratch memory (tracemalloc sees
+NumPy allocations but not PIL's internal buffers).
+
+Usage (from the example directory):
+    python -m benchmarks.filters [--size 4000x3000] [--tile-rows 256] [--runs 5]
+"""
+
+import time
+import argparse
+import tracemalloc
+import numpy as np
+from PIL import Image
+from benchmarks.executor import FILTERS, load_fixtures
+from utils.filters import apply_filter
+from utils.kernels import fused_filters
+
+def measure(func, runs):
+    """Return (best seconds, peak traced bytes) for func()."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def synthetic_image(width, height):
+    """Smooth gradients plus noise, so JPEG-like content rather than flat colour."""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width]
+    pixels = np.stack([x * 255 // width, y * 255 // height, (x + y) * 255 // (width + height)], axis=-1)
+    pixels = pixels + rng.integers(-20, 20, pixels.shape)
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+def compare(label, image, tile_rows, runs):
+    """Print current vs fused timings for one image."""
+    pixels = np.asarray(image)
+    print(f"\n{label}: {image.size[0]}x{image.size[1]}")
+    print(f"{'filters':<26}{'current ms':>12}{'fused ms':>10}{'speedup':>9}{'current MiB':>13}{'fused MiB':>11}")
+
+    cases = [[f] for f in FILTERS] + [FILTERS]
+    for filter_types in cases:
+        current = measure(lambda: [apply_filter(image, f) for f in filter_types], runs)
+        fused = measure(lambda: fused_filters(pixels, filter_types, tile_rows=tile_rows), runs)
+        print(
+            f"{'+'.join(filter_types):<26}{current[0] * 1e3:>12.1f}{fused[0] * 1e3:>10.1f}"
+            f"{current[0] / fused[0]:>8.2f}x{current[1] / 2**20:>13.1f}{fused[1] / 2**20:>11.1f}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="4000x3000", help="synthetic image WIDTHxHEIGHT")
+    parser.add_argument("--tile-rows", type=int, default=256)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for index, image in enumerate(load_fixtures()):
+        compare(f"fixture {index + 1}", image, args.tile_rows, args.runs)
+
+    width, height = (int(v) for v in args.size.split("x"))
+    compare("synthetic", synthetic_image(width, height), args.tile_rows, args.runs)
+
+if __name__ == "__main__":
+    main()
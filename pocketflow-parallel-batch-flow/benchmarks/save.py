@@ -0,0 +1,64 @@
+"""Saves per second: inline image.save() vs the threaded encoder pool.
+
+Encodes every filtered fixture (images x filters, repeated) to a temporary
+directory, first serially on the event loop as SaveImage used to, then
+through utils.encoder.save_jpeg at several pool sizes.
+
+Usage (from the example directory):
+    python -m benchmarks.save [--repeat 10] [--workers 1 2 4 8]
+                              [--quality 85] [--optimize] [--progressive]
+"""
+
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+from benchmarks.executor import FILTERS, load_fixtures
+from utils.executor import shutdown_executors
+from utils.encoder import save_jpeg
+from utils.filters import apply_filters
+
+async def save_inline(jobs, options):
+    """Save serially on the event loop."""
+    for image, path in jobs:
+        image.save(path, "JPEG", **options)
+
+async def save_pooled(jobs, options, workers):
+    """Save concurrently on the encoder pool."""
+    await asyncio.gather(*(save_jpeg(image, path, max_workers=workers, **options) for image, path in jobs))
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--quality", type=int, default=75)
+    parser.add_argument("--optimize", action="store_true")
+    parser.add_argument("--progressive", action="store_true")
+    args = parser.parse_args()
+    options = {"quality": args.quality, "optimize": args.optimize, "progressive": args.progressive}
+
+    filtered = [img for image in load_fixtures() for img in apply_filters(image, FILTERS).values()]
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        jobs = [
+            (image, os.path.join(out_dir, f"{i}_{r}.jpg"))
+            for r in range(args.repeat) for i, image in enumerate(filtered)
+        ]
+        print(f"{len(jobs)} saves, {options}, {os.cpu_count()} CPUs\n")
+        print(f"{'mode':<10}{'workers':>8}{'saves/s':>12}")
+
+        start = time.perf_counter()
+        await save_inline(jobs, options)
+        baseline = len(jobs) / (time.perf_counter() - start)
+        print(f"{'inline':<10}{'-':>8}{baseline:>12.1f}")
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            await save_pooled(jobs, options, workers)
+            rate = len(jobs) / (time.perf_counter() - start)
+            print(f"{'pool':<10}{workers:>8}{rate:>12.1f}  ({rate / baseline:.2f}x)")
+            shutdown_executors()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,14 +1,27 @@
 """Flow definitions for parallel image processing."""
 
+import asyncio
 from pocketflow import AsyncFlow, AsyncParallelBatchFlow
-from nodes import LoadImage, ApplyFilter, SaveImage, NoOp
+from nodes import LoadImage, ApplyFilter, SaveImage, NoOp, get_output_path
 
-def create_base_flow():
-    """Create flow for processing a single image with one filter."""
+def create_base_flow(load_executor=None, filter_executor=None, max_workers=None, engine="pil",
+                     jpeg_options=None, target_size=None, pixel_cache=None, record_saved=False):
+    """Create flow for processing a single image with one filter.
+    
+    Args:
+        load_executor: Executor for decoding ("thread", "process" or None for inline)
+        filter_executor: Executor for filtering ("thread", "process" or None for inline)
+        max_workers: Pool size for the executors
+        engine: Filter engine, "pil" or the fused "numpy" kernels
+        jpeg_options: SaveImage settings (quality, optimize, progressive)
+        target_size: Optional (width, height) to draft-decode images down to
+        pixel_cache: Optional PixelCache so repeated runs skip decoding
+        record_saved: Log saved outputs in shared["saved"] for a manifest
+    """
     # Create nodes
-    load = LoadImage()
-    apply_filter = ApplyFilter()
-    save = SaveImage()
+    load = LoadImage(executor=load_executor, max_workers=max_workers, target_size=target_size, cache=pixel_cache)
+    apply_filter = ApplyFilter(executor=filter_executor, max_workers=max_workers, engine=engine)
+    save = SaveImage(max_workers=max_workers, record_saved=record_saved, **(jpeg_options or {}))
     noop = NoOp()
     
     # Connect nodes
@@ -19,32 +32,147 @@ def create_base_flow():
     # Create flow
     return AsyncFlow(start=load)
 
-class ImageBatchFlow(AsyncParallelBatchFlow):
+class BoundedParallelBatchFlow(AsyncParallelBatchFlow):
+    """AsyncParallelBatchFlow that streams params through a concurrency window.
+    
+    prep_async may return any iterable or async iterable of params. With
+    max_concurrency set, params are pulled lazily and at most that many
+    sub-flows are in flight at once, so memory stays flat regardless of the
+    batch size. Without it, a sub-flow is launched for every params as soon
+    as it is pulled, like AsyncParallelBatchFlow.
+    """
+    
+    def __init__(self, start=None, max_concurrency=None):
+        super().__init__(start=start)
+        self.max_concurrency = max_concurrency
+    
+    async def _run_async(self, shared):
+        pr = await self.prep_async(shared) or []
+        in_flight = set()
+        try:
+            async for bp in _iterate(pr):
+                # Wait for a free slot before pulling the next params
+                if self.max_concurrency is not None and len(in_flight) >= self.max_concurrency:
+                    done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    # Retrieve every finished task's error, then re-raise the first
+                    errors = [task.exception() for task in done if not task.cancelled() and task.exception() is not None]
+                    if errors:
+                        raise errors[0]
+                in_flight.add(asyncio.create_task(self._orch_async(shared, {**self.params, **bp})))
+            await asyncio.gather(*in_flight)
+        finally:
+            # Only unfinished if a sub-flow failed or we were cancelled
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        return await self.post_async(shared, pr, None)
+
+async def _iterate(params):
+    """Iterate over a sync or async iterable of params."""
+    if hasattr(params, "__aiter__"):
+        async for bp in params:
+            yield bp
+    else:
+        for bp in params:
+            yield bp
+
+FILTERS = ["grayscale", "blur", "sepia"]
+
+class ImageBatchFlow(BoundedParallelBatchFlow):
     """Flow that processes multiple images with multiple filters in parallel."""
     
+    def __init__(self, start=None, fan_out=False, max_concurrency=None, manifest=None, settings=None):
+        """Initialize the batch flow.
+        
+        Args:
+            start: Base flow run once per parameter set
+            fan_out: If True, run one sub-flow per image that decodes it once
+                and applies every filter, instead of one sub-flow per
+                image-filter combination
+            max_concurrency: Maximum number of sub-flows in flight, or None
+                to launch them all at once
+            manifest: Optional BuildManifest; outputs it reports as current
+                are skipped, including their load/filter/save sub-flow
+            settings: Output-affecting settings recorded in the manifest
+        """
+        super().__init__(start=start, max_concurrency=max_concurrency)
+        self.fan_out = fan_out
+        self.manifest = manifest
+        self.settings = settings or {}
+    
     async def prep_async(self, shared):
-        """Generate parameters for each image-filter combination."""
-        # Get list of images and filters
+        """Lazily generate parameters for each image (fan-out) or image-filter combination.
+        
+        shared["images"] may be a list or any iterable, e.g. a directory
+        scan generator, and is only consumed as sub-flows are started.
+        """
+        # Get images and filters
         images = shared.get("images", [])
-        filters = ["grayscale", "blur", "sepia"]
+        filters = shared.get("filters", FILTERS)
         
-        # Create parameter combinations
-        params = []
-        for image_path in images:
-            for filter_type in filters:
-                params.append({
-                    "image_path": image_path,
-                    "filter": filter_type
-                })
+        if hasattr(images, "__len__"):
+            print(f"\nProcessing {len(images)} images with {len(filters)} filters...")
+            if self.fan_out:
+                print(f"Total sub-flows: {len(images)} (one decode per image)")
+            else:
+                print(f"Total combinations: {len(images) * len(filters)}")
+        else:
+            print(f"\nStreaming images with {len(filters)} filters...")
+        
+        if self.fan_out:
+            return (
+                {"image_path": image_path, "filters": stale}
+                for image_path in images
+                for stale in [self._stale_filters(image_path, filters)]
+                if stale
+            )
         
-        print(f"\nProcessing {len(images)} images with {len(filters)} filters...")
-        print(f"Total combinations: {len(params)}")
-        return params
+        # Create parameter combinations
+        return (
+            {"image_path": image_path, "filter": filter_type}
+            for image_path in images
+            for filter_type in self._stale_filters(image_path, filters)
+        )
+    
+    def _stale_filters(self, image_path, filters):
+        """Filters whose output for image_path is missing or out of date."""
+        if self.manifest is None:
+            return filters
+        stale = [
+            f for f in filters
+            if not self.manifest.is_current(
+                get_output_path(image_path, f),
+                self.manifest.signature(image_path, f, self.settings)
+            )
+        ]
+        if len(stale) < len(filters):
+            print(f"Up to date: {image_path} ({len(filters) - len(stale)} of {len(filters)} outputs)")
+        return stale
+    
+    async def post_async(self, shared, prep_res, exec_res):
+        """Record the outputs written by this run in the manifest."""
+        if self.manifest is not None:
+            for image_path, filter_type, output_path in shared.get("saved", []):
+                signature = self.manifest.signature(image_path, filter_type, self.settings)
+                self.manifest.record(output_path, signature)
+            self.manifest.save()
+        return exec_res
 
-def create_flow():
+def create_flow(load_executor=None, filter_executor=None, max_workers=None, fan_out=False, engine="pil",
+                max_concurrency=None, jpeg_options=None, target_size=None, pixel_cache=None,
+                manifest=None):
     """Create the complete parallel processing flow."""
     # Create base flow for single image processing
-    base_flow = create_base_flow()
+    base_flow = create_base_flow(
+        load_executor, filter_executor, max_workers, engine, jpeg_options, target_size, pixel_cache,
+        record_saved=manifest is not None
+    )
+    
+    # Settings that change output pixels, so changing one invalidates the manifest
+    settings = {"engine": engine, "target_size": target_size, "jpeg": jpeg_options or {}}
     
     # Wrap in parallel batch flow
-    return ImageBatchFlow(start=base_flow) 
\ No newline at end of file
+    return ImageBatchFlow(
+        start=base_flow, fan_out=fan_out, max_concurrency=max_concurrency,
+        manifest=manifest, settings=settings
+    )
@@ -3,6 +3,9 @@ import asyncio
 import numpy as np
 from PIL import Image
 from flow import create_flow
+from utils.executor import shutdown_executors
+from utils.pixel_cache import PixelCache
+from utils.manifest import BuildManifest
 
 def get_image_paths():
     """Get paths of existing images in the images directory."""
@@ -36,10 +39,21 @@ async def main():
     # Create shared store with image paths
     shared = {"images": image_paths}
     
-    # Create and run flow
-    flow = create_flow()
-    
-    await flow.run_async(shared)
+    # Create and run flow: decode each image once in a thread (PIL releases
+    # the GIL), then compute all filters in one fused NumPy pass in a process
+    # At most 8 sub-flows (and decoded images) are in flight at once, and
+    # decoded pixels are cached so the next run skips JPEG decoding, and
+    # outputs that are already up to date are skipped entirely
+    flow = create_flow(
+        load_executor="thread", filter_executor="process", fan_out=True, engine="numpy",
+        max_concurrency=8, pixel_cache=PixelCache(".pixel_cache", max_bytes=512 * 2**20),
+        manifest=BuildManifest("output/.manifest.json")
+    )
+    
+    try:
+        await flow.run_async(shared)
+    finally:
+        shutdown_executors()
     
     print("\nProcessing complete! Check the output/ directory for results.")
 
@@ -2,9 +2,24 @@
 
 import os
 import asyncio
-from PIL import Image, ImageFilter
-import numpy as np
 from pocketflow import AsyncNode
+from utils.executor import run_blocking
+from utils.filters import load_image, apply_filters
+from utils.encoder import save_jpeg
+
+# Simulated I/O and processing delays (seconds) that make the parallelism
+# visible in the demo; benchmarks set SIMULATE_DELAYS = False
+SIMULATE_DELAYS = True
+
+async def simulate_delay(seconds):
+    """Sleep for the demo delay unless delays are turned off."""
+    if SIMULATE_DELAYS:
+        await asyncio.sleep(seconds)
+
+def get_output_path(image_path, filter_type):
+    """Output file for an image-filter combination."""
+    base_name = os.path.splitext(os.path.basename(image_path))[0]
+    return f"output/{base_name}_{filter_type}.jpg"
 
 class NoOp(AsyncNode):
     """Node that does nothing, used as a terminal node."""
@@ -24,6 +39,16 @@ class NoOp(AsyncNode):
 class LoadImage(AsyncNode):
     """Node that loads an image from file."""
     
+    def __init__(self, executor=None, max_workers=None, target_size=None, cache=None):
+        """Initialize with an optional executor ("thread" or "process") for
+        decoding, an optional (width, height) to decode down to and an
+        optional PixelCache of decoded pixels."""
+        super().__init__()
+        self.executor = executor
+        self.max_workers = max_workers
+        self.target_size = target_size
+        self.cache = cache
+    
     async def prep_async(self, shared):
         """Get image path from parameters."""
         image_path = self.params["image_path"]
@@ -33,8 +58,11 @@ class LoadImage(AsyncNode):
     async def exec_async(self, image_path):
         """Load image using PIL."""
         # Simulate I/O delay
-        await asyncio.sleep(0.1)
-        return Image.open(image_path)
+        await simulate_delay(0.1)
+        return await run_blocking(
+            self.executor, load_image, image_path, self.target_size, self.cache,
+            max_workers=self.max_workers
+        )
     
     async def post_async(self, shared, prep_res, exec_res):
         """Store image in shared store."""
@@ -44,69 +72,86 @@ class LoadImage(AsyncNode):
 class ApplyFilter(AsyncNode):
     """Node that applies a filter to an image."""
     
+    def __init__(self, executor=None, max_workers=None, engine="pil"):
+        """Initialize with an optional executor ("thread" or "process") and
+        a filter engine ("pil" or the fused "numpy" kernels)."""
+        super().__init__()
+        self.executor = executor
+        self.max_workers = max_workers
+        self.engine = engine
+    
     async def prep_async(self, shared):
-        """Get image and filter type."""
+        """Get image and the filter(s) to apply to it."""
         image = shared["image"]
-        filter_type = self.params["filter"]
-        print(f"Applying {filter_type} filter...")
-        return image, filter_type
+        # Fan-out params carry a list of filters for one decoded image
+        filter_types = self.params.get("filters") or [self.params["filter"]]
+        print(f"Applying {', '.join(filter_types)} filter(s)...")
+        return image, filter_types
     
     async def exec_async(self, inputs):
-        """Apply the specified filter."""
-        image, filter_type = inputs
+        """Apply every requested filter to the same decoded image."""
+        image, filter_types = inputs
         
         # Simulate processing delay
-        await asyncio.sleep(0.5)
+        await simulate_delay(0.5)
         
-        if filter_type == "grayscale":
-            return image.convert("L")
-        elif filter_type == "blur":
-            return image.filter(ImageFilter.BLUR)
-        elif filter_type == "sepia":
-            # Convert to array for sepia calculation
-            img_array = np.array(image)
-            sepia_matrix = np.array([
-                [0.393, 0.769, 0.189],
-                [0.349, 0.686, 0.168],
-                [0.272, 0.534, 0.131]
-            ])
-            sepia_array = img_array.dot(sepia_matrix.T)
-            sepia_array = np.clip(sepia_array, 0, 255).astype(np.uint8)
-            return Image.fromarray(sepia_array)
-        else:
-            raise ValueError(f"Unknown filter: {filter_type}")
+        return await run_blocking(
+            self.executor, apply_filters, image, filter_types, self.engine,
+            max_workers=self.max_workers
+        )
     
     async def post_async(self, shared, prep_res, exec_res):
-        """Store filtered image."""
-        shared["filtered_image"] = exec_res
+        """Store filtered images, keyed by filter type."""
+        shared["filtered_images"] = exec_res
         return "save"
 
 class SaveImage(AsyncNode):
-    """Node that saves the processed image."""
+    """Node that saves the processed images."""
+    
+    def __init__(self, quality=75, optimize=False, progressive=False, max_workers=None,
+                 record_saved=False):
+        """Initialize JPEG settings, the size of the encoder thread pool and
+        whether to log saved outputs in shared["saved"] (for a manifest)."""
+        super().__init__()
+        self.quality = quality
+        self.optimize = optimize
+        self.progressive = progressive
+        self.max_workers = max_workers
+        self.record_saved = record_saved
     
     async def prep_async(self, shared):
-        """Prepare output path."""
-        image = shared["filtered_image"]
-        base_name = os.path.splitext(os.path.basename(self.params["image_path"]))[0]
-        filter_type = self.params["filter"]
-        output_path = f"output/{base_name}_{filter_type}.jpg"
+        """Prepare an output path for each filtered image.
+        
+        Everything post_async needs is returned here: parallel branches
+        overwrite shared["filtered_images"] while this one awaits.
+        """
+        filtered_images = shared["filtered_images"]
         
         # Create output directory if needed
         os.makedirs("output", exist_ok=True)
         
-        return image, output_path
+        return [
+            (filter_type, image, get_output_path(self.params["image_path"], filter_type))
+            for filter_type, image in filtered_images.items()
+        ]
     
-    async def exec_async(self, inputs):
-        """Save the image."""
-        image, output_path = inputs
-        
+    async def exec_async(self, outputs):
+        """Encode and write the images concurrently on the encoder pool."""
         # Simulate I/O delay
-        await asyncio.sleep(0.1)
+        await simulate_delay(0.1)
         
-        image.save(output_path)
-        return output_path
+        return await asyncio.gather(*(
+            save_jpeg(
+                image, output_path, self.quality, self.optimize, self.progressive,
+                max_workers=self.max_workers
+            )
+            for _, image, output_path in outputs
+        ))
     
     async def post_async(self, shared, prep_res, exec_res):
-        """Print success message."""
-        print(f"Saved: {exec_res}")
-        return "default" 
\ No newline at end of file
+        """Print success message and log what was saved for the build manifest."""
+        for (filter_type, _, _), output_path in zip(prep_res, exec_res):
+            if self.record_saved:
+                shared.setdefault("saved", []).append((self.params["image_path"], filter_type, output_path))
+            print(f"Saved: {output_path}")
+        return "default"
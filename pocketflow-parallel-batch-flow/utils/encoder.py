@@ -0,0 +1,36 @@
+"""JPEG encoding and file writes on a dedicated thread pool.
+
+Pillow's JPEG encoder releases the GIL while it compresses, so encodes for
+different images run in parallel on separate threads. Writing the encoded
+bytes happens on the same pool, so the event loop never blocks on disk.
+"""
+
+import io
+import os
+import asyncio
+from utils.executor import get_executor
+
+ENCODER_POOL = "jpeg-encoder"
+
+def encode_jpeg(image, quality=75, optimize=False, progressive=False):
+    """Encode an image to JPEG bytes."""
+    if image.mode not in ("RGB", "L", "CMYK"):
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=quality, optimize=optimize, progressive=progressive)
+    return buffer.getvalue()
+
+def write_file(path, data):
+    """Write bytes to path atomically, via a temporary file and rename."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+async def save_jpeg(image, output_path, quality=75, optimize=False, progressive=False, max_workers=None):
+    """Encode and write a JPEG without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    pool = get_executor("thread", max_workers, name=ENCODER_POOL)
+    data = await loop.run_in_executor(pool, encode_jpeg, image, quality, optimize, progressive)
+    return await loop.run_in_executor(pool, write_file, output_path, data)
@@ -0,0 +1,50 @@
+"""Executor helpers for moving blocking node work off the event loop."""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+# Shared pools, created on first use and keyed by (kind, max_workers, name)
+_executors = {}
+
+def get_executor(kind, max_workers=None, name=None):
+    """Return a shared executor for the given kind.
+
+    Args:
+        kind: "thread" for GIL-releasing work (PIL decode/encode, I/O),
+            "process" for CPU-bound Python/NumPy work, or an Executor
+            instance which is returned unchanged.
+        max_workers: Pool size, defaults to the pool's own default.
+        name: Optional pool name, giving a dedicated pool (and thread names)
+            separate from the shared one of the same kind.
+    """
+    if isinstance(kind, Executor):
+        return kind
+
+    key = (kind, max_workers, name)
+    if key not in _executors:
+        if kind == "thread":
+            _executors[key] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name or "")
+        elif kind == "process":
+            _executors[key] = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            raise ValueError(f"Unknown executor: {kind}")
+    return _executors[key]
+
+async def run_blocking(executor, func, *args, max_workers=None):
+    """Run func(*args) in the given executor, or inline if executor is None.
+
+    In "process" mode func and args must be picklable, so pass module-level
+    functions rather than bound node methods.
+    """
+    if executor is None:
+        return func(*args)
+
+    loop = asyncio.get_running_loop()
+    pool = get_executor(executor, max_workers)
+    return await loop.run_in_executor(pool, func, *args)
+
+def shutdown_executors():
+    """Shut down all shared executors."""
+    for pool in _executors.values():
+        pool.shutdown()
+    _executors.clear()
@@ -0,0 +1,83 @@
+"""Picklable image functions that can run inline or in an executor."""
+
+from PIL import Image, ImageFilter
+import numpy as np
+from utils.kernels import fused_filters
+from utils.pixel_cache import CACHEABLE_MODES
+
+SEPIA_MATRIX = np.array([
+    [0.393, 0.769, 0.189],
+    [0.349, 0.686, 0.168],
+    [0.272, 0.534, 0.131]
+])
+
+def load_image(image_path, target_size=None, cache=None):
+    """Open and decode an image, optionally only at preview size.
+
+    With a PixelCache, a hit returns an image built from the memory-mapped
+    pixels without touching the decoder, and a miss stores the decoded
+    pixels for the next run.
+
+    Image.open only reads the header. With target_size set, draft() tells
+    the JPEG decoder to scale by 1/2, 1/4 or 1/8 during the inverse DCT, to
+    the smallest scale that still covers target_size, so it never produces
+    full-resolution pixels. thumbnail() then resizes the rest of the way
+    while keeping the aspect ratio. Non-JPEG formats ignore draft() and are
+    decoded at full size before thumbnail() shrinks them.
+    """
+    if cache is not None:
+        pixels = cache.get(image_path, target_size)
+        if pixels is not None:
+            return Image.fromarray(pixels)
+
+    image = Image.open(image_path)
+    if target_size:
+        image.draft(image.mode, fit_size(image.size, target_size))
+        image.thumbnail(target_size)
+    image.load()
+
+    if cache is not None and image.mode in CACHEABLE_MODES:
+        cache.put(image_path, np.asarray(image), target_size)
+    return image
+
+def fit_size(size, target_size):
+    """Largest size with the same aspect ratio as size that fits target_size."""
+    width, height = size
+    scale = min(target_size[0] / width, target_size[1] / height, 1)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def apply_filter(image, filter_type):
+    """Apply a single named filter and return the new image."""
+    if filter_type == "grayscale":
+        return image.convert("L")
+    elif filter_type == "blur":
+        return image.filter(ImageFilter.BLUR)
+    elif filter_type == "sepia":
+        # Convert to array for sepia calculation
+        img_array = np.array(image)
+        sepia_array = img_array.dot(SEPIA_MATRIX.T)
+        sepia_array = np.clip(sepia_array, 0, 255).astype(np.uint8)
+        return Image.fromarray(sepia_array)
+    else:
+        raise ValueError(f"Unknown filter: {filter_type}")
+
+def apply_filters(image, filter_types, engine="pil"):
+    """Apply several filters to one decoded image.
+
+    Args:
+        image: Decoded PIL image
+        filter_types: Filter names to apply
+        engine: "pil" applies each filter separately through PIL/NumPy,
+            "numpy" computes all of them in one fused, tiled pass
+
+    Returns:
+        dict: Filtered image for each filter type, in the order given
+    """
+    if engine == "numpy":
+        pixels = np.asarray(image.convert("RGB") if image.mode != "RGB" else image)
+        arrays = fused_filters(pixels, filter_types)
+        return {filter_type: Image.fromarray(array) for filter_type, array in arrays.items()}
+    elif engine == "pil":
+        return {filter_type: apply_filter(image, filter_type) for filter_type in filter_types}
+    else:
+        raise ValueError(f"Unknown filter engine: {engine}")
@@ -0,0 +1,83 @@
+"""Build manifest for skipping image-filter outputs that are already up to date.
+
+For every output file, the manifest records what produced it: the SHA-256 of
+the input image, the filter name and the settings that affect the pixels
+(engine, target size, JPEG options), plus the output's own size and mtime.
+An output is current when all of these still match, so a batch re-run only
+processes new or changed inputs, changed settings, and outputs that were
+deleted or modified by hand.
+
+Input hashes are cached by (size, mtime) in the manifest too, so unchanged
+inputs are stat'ed rather than re-read on every run.
+
+This module is deliberately duplicated in pocketflow-batch-flow/utils/,
+so each example runs standalone. Apply every change to both copies.
+"""
+
+import os
+import json
+import hashlib
+
+class BuildManifest:
+    """JSON manifest of output files and the inputs that produced them."""
+
+    def __init__(self, path="output/.manifest.json"):
+        self.path = path
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        self.inputs = data.get("inputs", {})
+        self.outputs = data.get("outputs", {})
+
+    def input_hash(self, image_path):
+        """Return the SHA-256 of image_path, re-reading it only if its stat changed."""
+        stat = os.stat(image_path)
+        cached = self.inputs.get(image_path)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return cached["sha256"]
+
+        digest = hashlib.sha256()
+        with open(image_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self.inputs[image_path] = {
+            "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()
+        }
+        return digest.hexdigest()
+
+    def signature(self, image_path, filter_type, settings=None):
+        """Describe everything that determines an output's content."""
+        # Round-trip through JSON so tuples compare equal to stored lists
+        return json.loads(json.dumps({
+            "input": self.input_hash(image_path),
+            "filter": filter_type,
+            "settings": settings or {}
+        }))
+
+    def is_current(self, output_path, signature):
+        """True if output_path exists, is unmodified and was built from signature."""
+        entry = self.outputs.get(output_path)
+        if not entry or entry["signature"] != signature:
+            return False
+        try:
+            stat = os.stat(output_path)
+        except FileNotFoundError:
+            return False
+        return entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+
+    def record(self, output_path, signature):
+        """Record that output_path was just written from signature."""
+        stat = os.stat(output_path)
+        self.outputs[output_path] = {
+            "signature": signature, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns
+        }
+
+    def save(self):
+        """Write the manifest atomically."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"inputs": self.inputs, "outputs": self.outputs}, f, indent=1)
+        os.replace(tmp, self.path)
@@ -0,0 +1,177 @@
+"""Pages per second of WebCrawler and AsyncWebCrawler against a local site.
+
+Generates a static site of --pages linked HTML pages in a temporary
+directory and serves it with http.server (HTTP/1.1, so connections can be
+kept alive) in a separate process. The server can add --latency seconds to
+every response to stand in for network round trips. Each crawler then crawls
+the whole site, and the server's count of new TCP connections shows how
+many handshakes each mode paid for.
+
+Modes:
+    get        WebCrawler with a bare requests.get per page (no Session)
+    session    WebCrawler with its requests.Session
+    async      AsyncWebCrawler, once per --concurrency value
+
+Usage (from the example directory):
+    python -m benchmarks.crawl_throughput [--pages 500] [--latency 0.01]
+        [--concurrency 4 16 64] [--per-host 64] [--json out.json]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+import subprocess
+import contextlib
+import requests
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+EXAMPLE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def generate_site(root, pages, links=5, seed=42):
+    """Write pages page0.html .. page{n-1}.html, each linking to the next
+    page and to `links` random others, so the whole site is reachable."""
+    rng = random.Random(seed)
+    for i in range(pages):
+        targets = {(i + 1) % pages} | {rng.randrange(pages) for _ in range(links)}
+        paragraphs = "".join(f"<p>Paragraph {j} of page {i}. " + "Lorem ipsum dolor sit amet. " * 20 + "</p>"
+                             for j in range(5))
+        anchors = "".join(f'<li><a href="/page{t}.html">Page {t}</a></li>' for t in sorted(targets))
+        with open(os.path.join(root, f"page{i}.html"), "w") as f:
+            f.write(f"<html><head><title>Page {i}</title></head>"
+                    f"<body><h1>Page {i}</h1>{paragraphs}<ul>{anchors}</ul></body></html>")
+
+def serve(root, latency):
+    """Serve root on a free port, print the port and serve until killed."""
+    connections = 0
+    lock = threading.Lock()
+
+    class Handler(SimpleHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without TCP_NODELAY a
+        # kept-alive connection stalls on delayed ACKs after each response
+        disable_nagle_algorithm = True
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=root, **kwargs)
+
+        def setup(self):
+            # Called once per TCP connection, however many requests it carries
+            nonlocal connections
+            with lock:
+                connections += 1
+            super().setup()
+
+        def do_GET(self):
+            if self.path == "/__stats":
+                body = json.dumps({"connections": connections}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            if latency:
+                time.sleep(latency)
+            super().do_GET()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    print(server.server_address[1], flush=True)
+    server.serve_forever()
+
+def start_server(root, latency):
+    """Start the fixture server in a child process; return (process, base URL)."""
+    env = {**os.environ, "PYTHONPATH": EXAMPLE_DIR}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.crawl_throughput", "--serve", root, "--latency", str(latency)],
+        env=env, stdout=subprocess.PIPE, text=True
+    )
+    port = int(process.stdout.readline())
+    return process, f"http://127.0.0.1:{port}"
+
+def connections(base_url):
+    """Number of TCP connections the server has accepted so far, this one included."""
+    return requests.get(f"{base_url}/__stats").json()["connections"]
+
+class UnpooledSession:
+    """Session stand-in whose get is a bare requests.get (a new connection per page)."""
+    get = staticmethod(requests.get)
+
+    def close(self):
+        pass
+
+def run_one(base_url, pages, mode, concurrency, per_host):
+    """Crawl the whole site once and return the measurements."""
+    from tools.crawler import WebCrawler
+    from tools.async_crawler import AsyncWebCrawler
+
+    start_url = f"{base_url}/page0.html"
+    if mode == "async":
+        crawler = AsyncWebCrawler(start_url, pages, concurrency=concurrency, per_host=per_host)
+    else:
+        crawler = WebCrawler(start_url, pages)
+        if mode == "get":
+            crawler.session = UnpooledSession()
+
+    before = connections(base_url)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = crawler.crawl()
+    wall = time.perf_counter() - start
+    return {
+        "mode": mode,
+        "concurrency": concurrency if mode == "async" else 1,
+        "pages": len(results),
+        "wall_s": wall,
+        "pages_per_s": len(results) / wall,
+        # Less the connection of the first /__stats request
+        "connections": connections(base_url) - before - 1
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds added to every response")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--per-host", type=int, default=64)
+    parser.add_argument("--modes", nargs="+", choices=["get", "session", "async"], default=["get", "session", "async"])
+    parser.add_argument("--json", help="Also write all results to this file")
+    parser.add_argument("--serve", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.latency)
+        return
+
+    with tempfile.TemporaryDirectory() as root:
+        generate_site(root, args.pages)
+        server, base_url = start_server(root, args.latency)
+        try:
+            print(f"{args.pages} pages, {args.latency * 1000:.0f} ms latency, per_host={args.per_host}\n")
+            print(f"{'mode':<9}{'concurrency':>12}{'pages':>7}{'wall s':>9}{'pages/s':>10}{'connections':>13}")
+            results = []
+            for mode in args.modes:
+                for concurrency in args.concurrency if mode == "async" else [1]:
+                    result = run_one(base_url, args.pages, mode, concurrency, args.per_host)
+                    results.append(result)
+                    print(f"{mode:<9}{result['concurrency']:>12}{result['pages']:>7}{result['wall_s']:>9.2f}"
+                          f"{result['pages_per_s']:>10.1f}{result['connections']:>13}", flush=True)
+        finally:
+            server.terminate()
+            server.wait()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+
+if __name__ == "__main__":
+    main()
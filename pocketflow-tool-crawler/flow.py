@@ -1,14 +1,19 @@
 from pocketflow import Flow
 from nodes import CrawlWebsiteNode, AnalyzeContentBatchNode, GenerateReportNode
+from tools.async_crawler import AsyncWebCrawler
 
-def create_flow() -> Flow:
+def create_flow(concurrency: int = 16, per_host: int = 8) -> Flow:
     """Create and configure the crawling flow
     
+    Args:
+        concurrency: Pages fetched at once across all hosts
+        per_host: Pages fetched at once from any one host
+    
     Returns:
         Flow: Configured flow ready to run
     """
     # Create nodes
-    crawl = CrawlWebsiteNode()
+    crawl = CrawlWebsiteNode(AsyncWebCrawler, concurrency=concurrency, per_host=per_host)
     analyze = AnalyzeContentBatchNode()
     report = GenerateReportNode()
     
@@ -6,6 +6,13 @@ from typing import List, Dict
 class CrawlWebsiteNode(Node):
     """Node to crawl a website and extract content"""
     
+    def __init__(self, crawler=WebCrawler, **crawler_options):
+        """Use `crawler` (WebCrawler or AsyncWebCrawler) with extra options
+        such as concurrency, per_host or timeout"""
+        super().__init__()
+        self.crawler = crawler
+        self.crawler_options = crawler_options
+    
     def prep(self, shared):
         return shared.get("base_url"), shared.get("max_pages", 10)
         
@@ -14,7 +21,7 @@ class CrawlWebsiteNode(Node):
         if not base_url:
             return []
             
-        crawler = WebCrawler(base_url, max_pages)
+        crawler = self.crawler(base_url, max_pages, **self.crawler_options)
         return crawler.crawl()
         
     def post(self, shared, prep_res, exec_res):
@@ -0,0 +1,109 @@
+import asyncio
+import aiohttp
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from tools.crawler import WebCrawler
+from tools.frontier import URLFrontier
+
+class AsyncWebCrawler(WebCrawler):
+    """Concurrent web crawler on aiohttp, a drop-in replacement for WebCrawler
+
+    Pages are fetched by `concurrency` worker tasks sharing one aiohttp
+    session. Its connector keeps connections alive and pools them, with at
+    most `concurrency` open in total and `per_host` to any one host. Every
+    request has a total and a connect timeout. Pages are parsed the same way
+    as WebCrawler, and crawl() returns the same list of page dicts, ordered
+    by when each URL was discovered.
+    
+    crawl() runs its own event loop. Called from a thread whose loop is
+    already running (e.g. a Jupyter cell), it runs the crawl on a helper
+    thread and blocks until it finishes; async callers should await
+    crawl_async() instead.
+    """
+
+    def __init__(self, base_url: str, max_pages: int = 10, concurrency: int = 16,
+                 per_host: int = 8, timeout: float = 30.0, connect_timeout: float = 10.0,
+                 frontier_options: Optional[Dict] = None):
+        super().__init__(base_url, max_pages, timeout, frontier_options)
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.connect_timeout = connect_timeout
+
+    def make_session(self):
+        # crawl_async opens its own aiohttp session for each crawl
+        return None
+
+    async def fetch_page_content(self, session: aiohttp.ClientSession, url: str) -> Optional[Dict]:
+        """Fetch and parse a single page, or return None on failure"""
+        try:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                html = await response.text(errors="replace")
+            return self.parse_page(url, html)
+
+        except Exception as e:
+            print(f"Error crawling {url}: {str(e) or type(e).__name__}")
+            return None
+
+    async def crawl_async(self) -> List[Dict]:
+        """Crawl website starting from base_url with concurrent workers"""
+        to_visit = URLFrontier(**self.frontier_options)
+        to_visit.add(self.base_url)
+        results = []
+        in_flight = 0
+        popped = 0
+        # Wakes waiting workers when a fetch finishes and may have added URLs
+        changed = asyncio.Condition()
+
+        def finished():
+            return len(results) >= self.max_pages or (not to_visit and not in_flight)
+
+        def can_start():
+            # Only start a fetch that could still count toward max_pages
+            return bool(to_visit) and len(results) + in_flight < self.max_pages
+
+        async def worker(session):
+            nonlocal in_flight, popped
+            while True:
+                async with changed:
+                    await changed.wait_for(lambda: finished() or can_start())
+                    if finished():
+                        return
+                    url = to_visit.pop()
+                    # With the default FIFO frontier, pop order is discovery order
+                    order = popped
+                    popped += 1
+                    in_flight += 1
+
+                print(f"Crawling: {url}")
+                content = await self.fetch_page_content(session, url)
+
+                async with changed:
+                    in_flight -= 1
+                    if content:
+                        self.visited.add(url)
+                        results.append((order, content))
+                        # Add new URLs to visit
+                        for link in content["links"]:
+                            to_visit.add(link)
+                    changed.notify_all()
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host)
+        timeout = aiohttp.ClientTimeout(total=self.timeout, connect=self.connect_timeout)
+        try:
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                await asyncio.gather(*(worker(session) for _ in range(self.concurrency)))
+        finally:
+            to_visit.close()
+
+        return [content for _, content in sorted(results, key=lambda result: result[0])]
+
+    def crawl(self) -> List[Dict]:
+        """Crawl website starting from base_url"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.crawl_async())
+        # asyncio.run cannot nest inside a running loop, so use a fresh one on another thread
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, self.crawl_async()).result()
@@ -1,15 +1,26 @@
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
+from tools.frontier import URLFrontier
 
 class WebCrawler:
     """Simple web crawler that extracts content and follows links"""
     
-    def __init__(self, base_url: str, max_pages: int = 10):
+    def __init__(self, base_url: str, max_pages: int = 10, timeout: float = 30.0,
+                 frontier_options: Optional[Dict] = None):
         self.base_url = base_url
         self.max_pages = max_pages
+        self.timeout = timeout
+        # Passed to URLFrontier, e.g. max_in_memory or bloom_capacity
+        self.frontier_options = frontier_options or {}
         self.visited: Set[str] = set()
+        # One session keeps connections alive between pages of the same host
+        self.session = self.make_session()
+    
+    def make_session(self):
+        """Return the HTTP session crawl() fetches with; closed when it ends"""
+        return requests.Session()
         
     def is_valid_url(self, url: str) -> bool:
         """Check if URL belongs to the same domain"""
@@ -17,31 +28,34 @@ class WebCrawler:
         url_domain = urlparse(url).netloc
         return base_domain == url_domain
         
+    def parse_page(self, url: str, html: str) -> Dict:
+        """Extract title, text and same-domain links from a page's HTML"""
+        soup = BeautifulSoup(html, "html.parser")
+        
+        # Extract main content
+        content = {
+            "url": url,
+            "title": soup.title.string if soup.title else "",
+            "text": soup.get_text(separator="\n", strip=True),
+            "links": []
+        }
+        
+        # Extract links
+        for link in soup.find_all("a"):
+            href = link.get("href")
+            if href:
+                absolute_url = urljoin(url, href)
+                if self.is_valid_url(absolute_url):
+                    content["links"].append(absolute_url)
+        
+        return content
+        
     def extract_page_content(self, url: str) -> Dict:
         """Extract content from a single page"""
         try:
-            response = requests.get(url)
+            response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Extract main content
-            content = {
-                "url": url,
-                "title": soup.title.string if soup.title else "",
-                "text": soup.get_text(separator="\n", strip=True),
-                "links": []
-            }
-            
-            # Extract links
-            for link in soup.find_all("a"):
-                href = link.get("href")
-                if href:
-                    absolute_url = urljoin(url, href)
-                    if self.is_valid_url(absolute_url):
-                        content["links"].append(absolute_url)
-            
-            return content
+            return self.parse_page(url, response.text)
             
         except Exception as e:
             print(f"Error crawling {url}: {str(e)}")
@@ -49,26 +63,27 @@ class WebCrawler:
     
     def crawl(self) -> List[Dict]:
         """Crawl website starting from base_url"""
-        to_visit = [self.base_url]
+        # Each canonical URL is queued once, so nothing popped was visited
+        to_visit = URLFrontier(**self.frontier_options)
+        to_visit.add(self.base_url)
         results = []
         
-        while to_visit and len(self.visited) < self.max_pages:
-            url = to_visit.pop(0)
-            
-            if url in self.visited:
-                continue
+        try:
+            while to_visit and len(self.visited) < self.max_pages:
+                url = to_visit.pop()
                 
-            print(f"Crawling: {url}")
-            content = self.extract_page_content(url)
-            
-            if content:
-                self.visited.add(url)
-                results.append(content)
+                print(f"Crawling: {url}")
+                content = self.extract_page_content(url)
                 
-                # Add new URLs to visit
-                new_urls = [url for url in content["links"] 
-                          if url not in self.visited 
-                          and url not in to_visit]
-                to_visit.extend(new_urls)
+                if content:
+                    self.visited.add(url)
+                    results.append(content)
+                    
+                    # Add new URLs to visit
+                    for link in content["links"]:
+                        to_visit.add(link)
+        finally:
+            to_visit.close()
+            self.session.close()
         
         return results
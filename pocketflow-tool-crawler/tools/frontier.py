@@ -0,0 +1,220 @@
+import heapq
+import sqlite3
+import hashlib
+import math
+from collections import deque
+from typing import Optional
+from urllib.parse import urlsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Spilled entries written to disk per INSERT batch
+SPILL_BATCH = 1024
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so equivalent spellings compare equal
+
+    Lowercases the scheme and host, drops default ports and the fragment,
+    sorts query parameters and removes trailing slashes from the path (an
+    empty path becomes "/"). URLs without a host only lose the fragment.
+    """
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        # mailto:, relative references and the like: only drop the fragment
+        return url.strip().split("#", 1)[0]
+    scheme = parts.scheme.lower()
+    host = parts.hostname or ""
+    if ":" in host:
+        host = f"[{host}]"  # IPv6 literal
+    try:
+        port = parts.port
+    except ValueError:
+        # Malformed port: keep the address as written
+        port, host = None, parts.netloc.rpartition("@")[2].lower()
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    if parts.username:
+        credentials = parts.username + (f":{parts.password}" if parts.password else "")
+        host = f"{credentials}@{host}"
+    path = parts.path.rstrip("/") or "/"
+    # Sorted as written, so percent-encoding is left alone
+    query = "&".join(sorted(param for param in parts.query.split("&") if param))
+    return f"{scheme}://{host}{path}?{query}" if query else f"{scheme}://{host}{path}"
+
+class BloomFilter:
+    """Fixed-size set membership test with a bounded false positive rate
+
+    Never reports an added item as missing. It reports a new item as
+    present with probability about error_rate once `capacity` items have
+    been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-6):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str) -> bool:
+        """Add item; return whether it was absent (any bit was unset)"""
+        bits, absent = self.bits, False
+        for position in self._positions(item):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                absent = True
+        return absent
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+class URLFrontier:
+    """Queue of URLs to crawl that holds each canonical URL at most once
+
+    URLs come out in FIFO order (breadth-first), or by lowest priority when
+    priority=True. Dedupe is one set (or Bloom filter) lookup of the
+    canonical URL, and add and pop are O(1) (O(log n) with priorities). At
+    most `max_in_memory` queued URLs are kept in memory. The rest spill to a
+    temporary SQLite table ordered by (priority, sequence), written and read
+    back in batches. URLs are returned as first added, not canonicalized.
+    """
+
+    def __init__(self, max_in_memory: int = 100_000, priority: bool = False,
+                 bloom_capacity: Optional[int] = None, bloom_error_rate: float = 1e-6,
+                 spill_path: str = ""):
+        """Initialize the frontier
+
+        Args:
+            max_in_memory: Queued URLs kept in memory before spilling to disk
+            priority: Pop the lowest add() priority first instead of FIFO
+            bloom_capacity: Use a Bloom filter sized for this many URLs as
+                the seen set, so its memory is fixed (a false positive skips
+                a new URL)
+            bloom_error_rate: False positive rate of the Bloom filter
+            spill_path: SQLite file for spilled URLs ("" is a temporary file
+                removed on close)
+        """
+        self.max_in_memory = max_in_memory
+        self.priority = priority
+        self.seen = BloomFilter(bloom_capacity, bloom_error_rate) if bloom_capacity else set()
+        self.spill_path = spill_path
+        # Entries are (priority, sequence, url); a heap or a FIFO deque
+        self.queue = [] if priority else deque()
+        self.sequence = 0
+        self.spilled = 0
+        self.spill_head = None  # smallest spilled entry, when priority=True
+        self.pending = []  # spilled entries not yet written
+        self.conn = None
+
+    def __len__(self) -> int:
+        return len(self.queue) + self.spilled
+
+    def __contains__(self, url: str) -> bool:
+        """Whether url (in any spelling) was ever added"""
+        return canonicalize_url(url) in self.seen
+
+    def add(self, url: str, priority: float = 0.0) -> bool:
+        """Queue url unless it was seen before; return whether it was queued"""
+        key = canonicalize_url(url)
+        if isinstance(self.seen, BloomFilter):
+            # One pass over the bits both tests and sets them
+            if not self.seen.add(key):
+                return False
+        elif key in self.seen:
+            return False
+        else:
+            self.seen.add(key)
+
+        entry = (priority if self.priority else 0.0, self.sequence, url)
+        self.sequence += 1
+        # In FIFO order anything added after a spill must queue behind it
+        if len(self.queue) >= self.max_in_memory or (self.spilled and not self.priority):
+            self._spill(entry)
+        elif self.priority:
+            heapq.heappush(self.queue, entry)
+        else:
+            self.queue.append(entry)
+        return True
+
+    def pop(self) -> str:
+        """Remove and return the next URL; raise IndexError when empty"""
+        if self.priority:
+            # The next URL is the smaller of the in-memory and spilled heads
+            if self.spilled and (not self.queue or self.spill_head < self.queue[0]):
+                if len(self.queue) < self.max_in_memory:
+                    self._refill()
+                else:
+                    return self._pop_spilled()
+            return heapq.heappop(self.queue)[2]
+
+        if not self.queue and self.spilled:
+            self._refill()
+        return self.queue.popleft()[2]
+
+    def _spill(self, entry):
+        """Queue one entry for the spill table, writing in batches"""
+        self.pending.append(entry)
+        self.spilled += 1
+        if self.priority and (self.spill_head is None or entry < self.spill_head):
+            self.spill_head = entry
+        if len(self.pending) >= SPILL_BATCH:
+            self._flush()
+
+    def _flush(self):
+        """Write pending spilled entries to the spill table"""
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.spill_path)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS frontier (
+                    priority REAL NOT NULL,
+                    sequence INTEGER NOT NULL,
+                    url TEXT NOT NULL,
+                    PRIMARY KEY (priority, sequence)
+                ) WITHOUT ROWID
+            """)
+        self.conn.executemany("INSERT INTO frontier VALUES (?, ?, ?)", self.pending)
+        self.pending.clear()
+
+    def _take_spilled(self, limit: int):
+        """Remove and return the `limit` smallest spilled entries"""
+        self._flush()
+        rows = self.conn.execute(
+            "SELECT priority, sequence, url FROM frontier ORDER BY priority, sequence LIMIT ?", (limit,)
+        ).fetchall()
+        if rows:
+            self.conn.execute(
+                "DELETE FROM frontier WHERE (priority, sequence) <= (?, ?)", rows[-1][:2]
+            )
+        self.spilled -= len(rows)
+        if self.priority:
+            self.spill_head = self.conn.execute(
+                "SELECT priority, sequence, url FROM frontier ORDER BY priority, sequence LIMIT 1"
+            ).fetchone()
+        return rows
+
+    def _refill(self):
+        """Move spilled entries back into memory, up to max_in_memory"""
+        rows = self._take_spilled(max(1, self.max_in_memory - len(self.queue)))
+        if self.priority:
+            for row in rows:
+                heapq.heappush(self.queue, row)
+        else:
+            self.queue.extend(rows)
+
+    def _pop_spilled(self) -> str:
+        """Pop the smallest spilled entry straight from disk"""
+        return self._take_spilled(1)[0][2]
+
+    def close(self):
+        """Drop the spill table and every URL spilled to it"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        self.spilled = 0
+        self.spill_head = None
+        self.pending.clear()